@@ -0,0 +1,170 @@
+import argparse
+import functools
+import importlib.util
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "laba4"))
+
+import graph_analyzer as analyze
+import graph_generator as gen
+from graph_csr import CSRGraph, open_csr_mmap
+
+
+def load_lab_module(module_name, relative_path):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    module_path = os.path.join(REPO_ROOT, relative_path)
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    sys.path.insert(0, os.path.dirname(module_path))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(os.path.dirname(module_path))
+    return module
+
+
+DENSE_STAGE_LIMIT = 2000
+
+lab5_traversal = load_lab_module("laba5_traversal", os.path.join("laba5", "traversal.py"))
+lab6 = load_lab_module("laba6_main", os.path.join("laba6", "main.py"))
+lab6_boruvka = load_lab_module("laba6_boruvka", os.path.join("laba6", "boruvka.py"))
+lab6_weights = lab6
+if importlib.util.find_spec("numpy") is not None:
+    lab6_weights = load_lab_module("laba6_weights_np", os.path.join("laba6", "graph_weights_np.py"))
+
+
+def traversal_order(graph, kind):
+    engine = lab5_traversal.TraversalEngine(graph)
+    result = engine.bfs_direction_optimizing() if kind == "BFS" else engine.run(kind)
+    return [node + 1 for node in result.order]
+
+
+def _mst_summary(num_vertices, weight_graph, weight_matrix=None):
+    mst_algo = lab6.create_mst_algorithm(num_vertices, weight_graph, "auto", weight_matrix=weight_matrix)
+    mst_total_weight, mst_edges = mst_algo.run()
+    mst_edges = sorted(mst_edges, key=lambda edge: (edge[2], edge[0], edge[1]))
+    return mst_total_weight, [(u + 1, v + 1, weight) for u, v, weight in mst_edges]
+
+
+def minimum_spanning_tree(adj_matrix_dir, seed):
+    adj_matrix_undir = lab6_weights.generate_Aundir(adj_matrix_dir)
+    weights = lab6_weights.generate_W(len(adj_matrix_dir), seed, adj_matrix_undir)
+    return _mst_summary(len(adj_matrix_dir), CSRGraph.from_matrix(weights, weighted=True), weights)
+
+
+def analyze_graph(graph, undirected_graph):
+    out_degrees, in_degrees = analyze.calculate_directed_degrees(graph)
+    undir_degrees = analyze.calculate_undirected_degrees(undirected_graph)
+    dir_pendant, dir_isolated = analyze.find_special_vertices_directed(out_degrees, in_degrees)
+    undir_pendant, undir_isolated = analyze.find_special_vertices_undirected(undir_degrees)
+    scc_list = analyze.tarjan_strongly_connected_components(graph)
+    condensation_adj, _ = analyze.build_condensation_graph(graph, scc_list)
+
+    record = {
+        "n": graph.num_vertices,
+        "edges": graph.num_edges,
+        "out_degrees": out_degrees,
+        "in_degrees": in_degrees,
+        "undirected_degrees": undir_degrees,
+        "directed_regular": analyze.check_directed_regularity(out_degrees, in_degrees)[0],
+        "undirected_regular": analyze.check_undirected_regularity(undir_degrees)[0],
+        "directed_pendant": dir_pendant,
+        "directed_isolated": dir_isolated,
+        "undirected_pendant": undir_pendant,
+        "undirected_isolated": undir_isolated,
+        "paths_len2": None,
+        "paths_len3": None,
+        "reachable_pairs": None,
+        "sccs": scc_list,
+        "condensation_edges": sum(map(sum, condensation_adj)),
+        "bfs_order": traversal_order(graph, "BFS"),
+        "dfs_order": traversal_order(graph, "DFS"),
+    }
+    if graph.num_vertices <= DENSE_STAGE_LIMIT:
+        record["paths_len2"] = analyze.count_total_paths_of_length(graph, 2)
+        record["paths_len3"] = analyze.count_total_paths_of_length(graph, 3)
+        reach_bits = analyze.warshall_reachability_bitsets(graph)
+        record["reachable_pairs"] = sum(bits.bit_count() for bits in reach_bits)
+    return record
+
+
+def run_job(job):
+    seed, n, k = job
+    adj_matrix_dir = gen.create_directed_graph_matrix(n, k, seed)
+    adj_matrix_undir = gen.convert_to_undirected_graph(adj_matrix_dir)
+    record = {"seed": seed, "k": k}
+    record.update(analyze_graph(CSRGraph.from_matrix(adj_matrix_dir), adj_matrix_undir))
+    record["mst_weight"], record["mst_edges"] = minimum_spanning_tree(adj_matrix_dir, seed)
+    return record
+
+
+_mapped_graphs = {}
+
+
+def open_shared_graph(path):
+    graph = _mapped_graphs.get(path)
+    if graph is None:
+        graph = _mapped_graphs[path] = open_csr_mmap(path)
+    return graph
+
+
+def run_graph_file_job(path, mst_workers=0):
+    graph = open_shared_graph(path)
+    record = {"graph_file": path}
+    record.update(analyze_graph(graph, graph.symmetrized()))
+    record["mst_weight"], record["mst_edges"] = (None, None)
+    if graph.weights is not None and mst_workers:
+        mst_total_weight, mst_edges = lab6_boruvka.parallel_boruvka_mst(graph.num_vertices, graph, mst_workers)
+        record["mst_weight"], record["mst_edges"] = mst_total_weight, [(u + 1, v + 1, w) for u, v, w in mst_edges]
+    elif graph.weights is not None:
+        record["mst_weight"], record["mst_edges"] = _mst_summary(graph.num_vertices, graph)
+    return record
+
+
+def build_jobs(seeds, sizes, k_values):
+    return list(itertools.product(seeds, sizes, k_values))
+
+
+def run_batch(jobs, output, workers=None, chunksize=1, graph_files=(), mst_workers=0):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        graph_file_job = functools.partial(run_graph_file_job, mst_workers=mst_workers)
+        records = itertools.chain(executor.map(graph_file_job, graph_files),
+                                  executor.map(run_job, jobs, chunksize=chunksize))
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетний аналіз графів без GUI")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[4310])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11])
+    parser.add_argument("--ks", type=float, nargs="+", default=[0.69, 0.725])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--graph-files", nargs="+", default=[])
+    parser.add_argument("--mst-workers", type=int, default=0)
+    parser.add_argument("--output", default="-")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = build_jobs(args.seeds, args.sizes, args.ks) if not args.graph_files else []
+    graph_files = [os.path.abspath(path) for path in args.graph_files]
+    if args.output == "-":
+        run_batch(jobs, sys.stdout, args.workers, args.chunksize, graph_files, args.mst_workers)
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            run_batch(jobs, output, args.workers, args.chunksize, graph_files, args.mst_workers)
+
+
+if __name__ == "__main__":
+    main()
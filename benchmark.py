@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import batch_runner
+from batch_runner import analyze, gen, lab5_traversal, lab6
+
+BASELINE_PATH = os.path.join(batch_runner.REPO_ROOT, "benchmark_baseline.json")
+BENCH_SIZES = [30, 60, 120]
+BENCH_K_VALUES = [0.52, 0.6]
+BENCH_SEED = 4310
+BENCH_REPEATS = 3
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+TIME_SLACK_SECONDS = 0.002
+
+
+def _run_traversal(engine, kind):
+    events = 0
+    start = engine.find_start_node()
+    while start != -1:
+        for _ in engine.steps(kind, start):
+            events += 1
+        start = engine.find_start_node(for_new_component=True)
+    return events
+
+
+def _order_checksum(result):
+    return sum(position * vertex for position, vertex in enumerate(result.order, 1))
+
+
+def _run_shortest_path_queries(index):
+    n = index.num_vertices
+    return sum(hops for hops, _ in index.query_many((i, (i * 7 + 3) % n) for i in range(n)))
+
+
+def _prepare_kruskal(adj_matrix, seed):
+    adj_matrix_undir = lab6.generate_Aundir(adj_matrix)
+    weights = lab6.generate_W(len(adj_matrix), seed, adj_matrix_undir)
+    return len(adj_matrix), [(weights[i][j], i, j) for i in range(len(adj_matrix))
+                             for j in range(i + 1, len(adj_matrix)) if adj_matrix_undir[i][j] == 1]
+
+
+def _run_kruskal(mst_input, seed):
+    num_vertices, edges = mst_input
+    return lab6.KruskalAlgorithm(num_vertices, edges).run()[0]
+
+
+def _prepare_mst_auto(adj_matrix, seed):
+    weights = lab6.generate_W(len(adj_matrix), seed, lab6.generate_Aundir(adj_matrix))
+    return len(adj_matrix), batch_runner.CSRGraph.from_matrix(weights, weighted=True), weights
+
+
+def _run_mst_auto(mst_input, seed):
+    num_vertices, weight_graph, weights = mst_input
+    return lab6.create_mst_algorithm(num_vertices, weight_graph, "auto", weight_matrix=weights).run()[0]
+
+
+def _prepare_traversal(adj_matrix, seed):
+    return lab5_traversal.TraversalEngine(adj_matrix)
+
+
+def _prepare_shortest_paths(adj_matrix, seed):
+    return lab5_traversal.ShortestPathIndex(adj_matrix)
+
+
+def _condensation_checksum(adj_matrix):
+    scc_list = analyze.tarjan_strongly_connected_components(adj_matrix)
+    condensation_adj, _ = analyze.build_condensation_graph(adj_matrix, scc_list)
+    return sum(map(sum, condensation_adj)) * 100003 + len(scc_list)
+
+
+BENCH_ALGORITHMS = {
+    "warshall": (None, lambda adj_matrix, seed: sum(map(sum, analyze.warshall_reachability_matrix(adj_matrix)))),
+    "paths_len2": (None, lambda adj_matrix, seed: len(analyze.find_paths_of_length(adj_matrix, 2))),
+    "paths_len3": (None, lambda adj_matrix, seed: len(analyze.find_paths_of_length(adj_matrix, 3))),
+    "condensation": (None, lambda adj_matrix, seed: _condensation_checksum(adj_matrix)),
+    "bfs": (_prepare_traversal, lambda engine, seed: _run_traversal(engine, "BFS")),
+    "dfs": (_prepare_traversal, lambda engine, seed: _run_traversal(engine, "DFS")),
+    "bfs_results": (_prepare_traversal, lambda engine, seed: _order_checksum(engine.run("BFS"))),
+    "bfs_direction_optimizing": (_prepare_traversal,
+                                 lambda engine, seed: _order_checksum(engine.bfs_direction_optimizing())),
+    "shortest_paths": (_prepare_shortest_paths, lambda index, seed: _run_shortest_path_queries(index)),
+    "kruskal": (_prepare_kruskal, _run_kruskal),
+    "mst_auto": (_prepare_mst_auto, _run_mst_auto),
+}
+
+
+def measure(algorithm, adj_matrix, seed, repeats):
+    prepare, run = algorithm
+    best_seconds = None
+    for _ in range(repeats):
+        data = prepare(adj_matrix, seed) if prepare else adj_matrix
+        started = time.perf_counter()
+        checksum = run(data, seed)
+        elapsed = time.perf_counter() - started
+        if best_seconds is None or elapsed < best_seconds:
+            best_seconds = elapsed
+    data = prepare(adj_matrix, seed) if prepare else adj_matrix
+    tracemalloc.start()
+    run(data, seed)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best_seconds, "peak_kib": peak_bytes / 1024, "checksum": checksum}
+
+
+def run_benchmarks(sizes, k_values, seed, repeats, selected=None):
+    results = {}
+    for n in sizes:
+        for k in k_values:
+            adj_matrix = gen.create_directed_graph_matrix(n, k, seed)
+            for name, algorithm in BENCH_ALGORITHMS.items():
+                if selected and name not in selected:
+                    continue
+                case_name = f"{name}/n={n}/k={k}"
+                results[case_name] = measure(algorithm, adj_matrix, seed, repeats)
+                print(f"{case_name:<32} {results[case_name]['seconds'] * 1000:10.2f} мс "
+                      f"{results[case_name]['peak_kib']:10.1f} КіБ", file=sys.stderr)
+    return results
+
+
+def compare_with_baseline(results, baseline, time_tolerance, memory_tolerance):
+    failures = []
+    for case_name, measured in results.items():
+        expected = baseline.get(case_name)
+        if expected is None:
+            continue
+        if measured["checksum"] != expected["checksum"]:
+            failures.append(f"{case_name}: результат {measured['checksum']} замість {expected['checksum']}")
+        if measured["seconds"] > expected["seconds"] * (1 + time_tolerance) + TIME_SLACK_SECONDS:
+            failures.append(f"{case_name}: час {measured['seconds'] * 1000:.2f} мс, "
+                            f"базовий {expected['seconds'] * 1000:.2f} мс")
+        if measured["peak_kib"] > expected["peak_kib"] * (1 + memory_tolerance):
+            failures.append(f"{case_name}: пам'ять {measured['peak_kib']:.1f} КіБ, "
+                            f"базова {expected['peak_kib']:.1f} КіБ")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмів на графах")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES)
+    parser.add_argument("--ks", type=float, nargs="+", default=BENCH_K_VALUES)
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--repeats", type=int, default=BENCH_REPEATS)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCH_ALGORITHMS))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.sizes, args.ks, args.seed, args.repeats, args.only)
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"Базові значення збережено у {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Файл базових значень {args.baseline} не знайдено, запустіть з --update-baseline")
+        return 1
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    failures = compare_with_baseline(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if failures:
+        print("РЕГРЕСІЯ:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"Усі {len(results)} вимірювань у межах базових значень.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,14 @@
+import itertools
+
+from graph_csr import CSRGraph
+
+STACK_WALK_MIN_BITS = 64
+
+
 def calculate_undirected_degrees(adj_matrix_undir):
+    if isinstance(adj_matrix_undir, CSRGraph):
+        return [adj_matrix_undir.out_degree(i) + (1 if adj_matrix_undir.has_edge(i, i) else 0)
+                for i in range(adj_matrix_undir.num_vertices)]
     n = len(adj_matrix_undir)
     degrees = [0] * n
     for i in range(n):
@@ -10,6 +20,8 @@ def calculate_undirected_degrees(adj_matrix_undir):
     return degrees
 
 def calculate_directed_degrees(adj_matrix_dir):
+    if isinstance(adj_matrix_dir, CSRGraph):
+        return adj_matrix_dir.out_degrees(), adj_matrix_dir.in_degrees()
     n = len(adj_matrix_dir)
     out_degrees = [sum(row) for row in adj_matrix_dir]
     in_degrees = [sum(adj_matrix_dir[k][i] for k in range(n)) for i in range(n)]
@@ -39,40 +51,313 @@ def find_special_vertices_directed(out_degrees, in_degrees):
     isolated = [i + 1 for i, (o, inv) in enumerate(zip(out_degrees, in_degrees)) if o == 0 and inv == 0]
     return pendant, isolated
 
-def find_paths_of_length(adj_matrix, length):
-    n = len(adj_matrix)
-    found_paths = []
-    if length == 2:
-        for i in range(n):
-            for m in range(n):
-                if adj_matrix[i][m] == 1:
-                    for j in range(n):
-                        if adj_matrix[m][j] == 1:
-                            found_paths.append(f"{i+1} -> {m+1} -> {j+1}")
-    elif length == 3:
-        for i in range(n):
-            for m in range(n):
-                if adj_matrix[i][m] == 1:
-                    for p in range(n):
-                        if adj_matrix[m][p] == 1:
-                            for j in range(n):
-                                if adj_matrix[p][j] == 1:
-                                    found_paths.append(f"{i+1} -> {m+1} -> {p+1} -> {j+1}")
-    return found_paths
-
-def warshall_reachability_matrix(adj_matrix):
-    n = len(adj_matrix)
-    reach_matrix = [row[:] for row in adj_matrix]
-    for i in range(n):
-        reach_matrix[i][i] = 1
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                if reach_matrix[i][k] == 1 and reach_matrix[k][j] == 1:
-                    reach_matrix[i][j] = 1
+class _DegreeHistogram:
+    def __init__(self, degrees):
+        self.counts = {}
+        for degree in degrees:
+            self.counts[degree] = self.counts.get(degree, 0) + 1
+        self.min_degree = min(self.counts) if self.counts else 0
+        self.max_degree = max(self.counts) if self.counts else 0
+
+    def move(self, old_degree, new_degree):
+        counts = self.counts
+        counts[new_degree] = counts.get(new_degree, 0) + 1
+        counts[old_degree] -= 1
+        if counts[old_degree] == 0:
+            del counts[old_degree]
+        if new_degree > self.max_degree:
+            self.max_degree = new_degree
+        if new_degree < self.min_degree:
+            self.min_degree = new_degree
+        while self.min_degree not in counts:
+            self.min_degree += 1
+        while self.max_degree not in counts:
+            self.max_degree -= 1
+
+    def count(self, degree):
+        return self.counts.get(degree, 0)
+
+
+class DegreeTracker:
+    def __init__(self, num_vertices, directed=True):
+        self.num_vertices = num_vertices
+        self.directed = directed
+        self.edges = set()
+        self.out_degrees = [0] * num_vertices
+        self.in_degrees = [0] * num_vertices
+        self.degrees = [0] * num_vertices
+        self.out_histogram = _DegreeHistogram(self.out_degrees)
+        self.in_histogram = _DegreeHistogram(self.in_degrees)
+        self.histogram = _DegreeHistogram(self.degrees)
+
+    @classmethod
+    def from_matrix(cls, adj_matrix, directed=True):
+        tracker = cls(len(adj_matrix), directed)
+        for u, u_neighbors in enumerate(adjacency_lists(adj_matrix)):
+            for v in u_neighbors:
+                if directed or u <= v:
+                    tracker.add_edge(u, v)
+        return tracker
+
+    def _edge_key(self, u, v):
+        if self.directed or u <= v:
+            return u, v
+        return v, u
+
+    def _shift_degree(self, degrees, histogram, vertex, delta):
+        old_degree = degrees[vertex]
+        degrees[vertex] = old_degree + delta
+        histogram.move(old_degree, old_degree + delta)
+
+    def _apply(self, u, v, delta):
+        if self.directed:
+            self._shift_degree(self.out_degrees, self.out_histogram, u, delta)
+            self._shift_degree(self.in_degrees, self.in_histogram, v, delta)
+            self._shift_degree(self.degrees, self.histogram, u, delta)
+            self._shift_degree(self.degrees, self.histogram, v, delta)
+        elif u == v:
+            self._shift_degree(self.degrees, self.histogram, u, 2 * delta)
+        else:
+            self._shift_degree(self.degrees, self.histogram, u, delta)
+            self._shift_degree(self.degrees, self.histogram, v, delta)
+
+    def add_edge(self, u, v):
+        key = self._edge_key(u, v)
+        if key in self.edges:
+            return False
+        self.edges.add(key)
+        self._apply(u, v, 1)
+        return True
+
+    def remove_edge(self, u, v):
+        key = self._edge_key(u, v)
+        if key not in self.edges:
+            return False
+        self.edges.remove(key)
+        self._apply(u, v, -1)
+        return True
+
+    def apply_batch(self, added_edges=(), removed_edges=()):
+        for u, v in removed_edges:
+            self.remove_edge(u, v)
+        for u, v in added_edges:
+            self.add_edge(u, v)
+
+    @property
+    def num_edges(self):
+        return len(self.edges)
+
+    @property
+    def min_degree(self):
+        return self.histogram.min_degree
+
+    @property
+    def max_degree(self):
+        return self.histogram.max_degree
+
+    @property
+    def pendant_count(self):
+        return self.histogram.count(1)
+
+    @property
+    def isolated_count(self):
+        return self.histogram.count(0)
+
+    def check_regularity(self):
+        if self.num_vertices == 0:
+            return False, 0
+        if not self.directed:
+            is_regular = self.histogram.min_degree == self.histogram.max_degree
+            return is_regular, self.histogram.min_degree if is_regular else 0
+        out_degree = self.out_histogram.min_degree
+        is_regular = (self.out_histogram.max_degree == out_degree and
+                      self.in_histogram.min_degree == self.in_histogram.max_degree == out_degree)
+        return is_regular, out_degree if is_regular else 0
+
+    def special_vertices(self):
+        pendant = [i + 1 for i, degree in enumerate(self.degrees) if degree == 1]
+        isolated = [i + 1 for i, degree in enumerate(self.degrees) if degree == 0]
+        return pendant, isolated
+
+def iter_paths_of_length(adj_matrix, length):
+    if length < 1:
+        return
+    neighbors = adjacency_lists(adj_matrix)
+    for start in range(len(neighbors)):
+        path = [start]
+        positions = [0]
+        while positions:
+            u = path[-1]
+            pos = positions[-1]
+            if pos == len(neighbors[u]):
+                path.pop()
+                positions.pop()
+                continue
+            positions[-1] = pos + 1
+            v = neighbors[u][pos]
+            if len(path) == length:
+                yield tuple(node + 1 for node in path) + (v + 1,)
+            else:
+                path.append(v)
+                positions.append(0)
+
+def find_paths_of_length(adj_matrix, length, limit=None):
+    paths = itertools.islice(iter_paths_of_length(adj_matrix, length), limit)
+    return [" -> ".join(map(str, path)) for path in paths]
+
+def _multiply_count_matrices(left, right):
+    n = len(left)
+    right_rows = [[(j, value) for j, value in enumerate(row) if value] for row in right]
+    product = []
+    for row in left:
+        result_row = [0] * n
+        for m, left_value in enumerate(row):
+            if left_value:
+                for j, right_value in right_rows[m]:
+                    result_row[j] += left_value * right_value
+        product.append(result_row)
+    return product
+
+def count_paths_of_length(adj_matrix, length):
+    base = adj_matrix
+    if isinstance(adj_matrix, CSRGraph):
+        base = adj_matrix.to_matrix()
+    elif adj_matrix and isinstance(adj_matrix[0], int):
+        base = bitsets_to_matrix(adj_matrix)
+    n = len(base)
+    result = [[1 if i == j else 0 for j in range(n)] for i in range(n)]
+    power = [row[:] for row in base]
+    while length > 0:
+        if length & 1:
+            result = _multiply_count_matrices(result, power)
+        length >>= 1
+        if length:
+            power = _multiply_count_matrices(power, power)
+    return result
+
+def count_total_paths_of_length(adj_matrix, length):
+    neighbors = adjacency_lists(adj_matrix)
+    path_counts = [1] * len(neighbors)
+    for _ in range(length):
+        path_counts = [sum(path_counts[v] for v in row) for row in neighbors]
+    return sum(path_counts)
+
+def matrix_to_bitsets(adj_matrix):
+    bitsets = []
+    for row in adj_matrix:
+        bits = 0
+        for j, value in enumerate(row):
+            if value == 1:
+                bits |= 1 << j
+        bitsets.append(bits)
+    return bitsets
+
+def bitsets_to_matrix(bitsets, n=None):
+    if n is None: n = len(bitsets)
+    return [[(bits >> j) & 1 for j in range(n)] for bits in bitsets]
+
+def iter_bits(bits):
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
+def _as_bitsets(rows):
+    if isinstance(rows, CSRGraph):
+        bitsets = []
+        for u in range(rows.num_vertices):
+            bits = 0
+            for v in rows.out_neighbors(u):
+                bits |= 1 << v
+            bitsets.append(bits)
+        return bitsets
+    if rows and isinstance(rows[0], int):
+        return list(rows)
+    return matrix_to_bitsets(rows)
+
+def _lowest_stacked_index(stacked, scc_stack, index_of):
+    if stacked.bit_count() < STACK_WALK_MIN_BITS:
+        return min(index_of[w] for w in iter_bits(stacked))
+    for w in scc_stack:
+        if stacked >> w & 1:
+            return index_of[w]
+
+def warshall_reachability_bitsets(adj_matrix):
+    rows = _as_bitsets(adj_matrix)
+    n = len(rows)
+    index_of = [-1] * n
+    low_link = [0] * n
+    component_of = [-1] * n
+    component_reach = []
+    unvisited = (1 << n) - 1
+    on_stack = 0
+    scc_stack = []
+    next_index = 0
+    for root in range(n):
+        if index_of[root] != -1:
+            continue
+        index_of[root] = low_link[root] = next_index
+        next_index += 1
+        unvisited ^= 1 << root
+        on_stack |= 1 << root
+        scc_stack.append(root)
+        call_stack = [root]
+        while call_stack:
+            u = call_stack[-1]
+            pending = rows[u] & unvisited
+            if pending:
+                v = (pending & -pending).bit_length() - 1
+                index_of[v] = low_link[v] = next_index
+                next_index += 1
+                unvisited ^= 1 << v
+                on_stack |= 1 << v
+                scc_stack.append(v)
+                call_stack.append(v)
+                continue
+            call_stack.pop()
+            stacked = rows[u] & on_stack
+            if stacked:
+                low_link[u] = min(low_link[u], _lowest_stacked_index(stacked, scc_stack, index_of))
+            if call_stack and low_link[u] < low_link[call_stack[-1]]:
+                low_link[call_stack[-1]] = low_link[u]
+            if low_link[u] != index_of[u]:
+                continue
+            component = len(component_reach)
+            members = successors = 0
+            while True:
+                w = scc_stack.pop()
+                component_of[w] = component
+                members |= 1 << w
+                successors |= rows[w]
+                if w == u:
+                    break
+            on_stack ^= members
+            reach = members
+            remaining = successors & ~reach
+            while remaining:
+                w = (remaining & -remaining).bit_length() - 1
+                reach |= component_reach[component_of[w]]
+                remaining &= ~reach
+            component_reach.append(reach)
+    return [component_reach[component] for component in component_of]
+
+def warshall_reachability_matrix(adj_matrix, with_bitsets=False):
+    reach_bits = warshall_reachability_bitsets(adj_matrix)
+    reach_matrix = bitsets_to_matrix(reach_bits)
+    if with_bitsets:
+        return reach_matrix, reach_bits
     return reach_matrix
 
+def strong_connectivity_bitsets(reach_bits):
+    members_by_reach = {}
+    for i, reach in enumerate(reach_bits):
+        members_by_reach[reach] = members_by_reach.get(reach, 0) | 1 << i
+    return [members_by_reach[reach] & reach if (reach >> i) & 1 else 0
+            for i, reach in enumerate(reach_bits)]
+
 def strong_connectivity_matrix(reach_matrix):
+    if reach_matrix and isinstance(reach_matrix[0], int):
+        return bitsets_to_matrix(strong_connectivity_bitsets(reach_matrix))
     n = len(reach_matrix)
     scc_matrix = [[0] * n for _ in range(n)]
     for i in range(n):
@@ -83,15 +368,75 @@ def strong_connectivity_matrix(reach_matrix):
 
 def find_strongly_connected_components(s_conn_matrix):
     n = len(s_conn_matrix)
+    scc_bits = _as_bitsets(s_conn_matrix)
     sccs = []
     visited_nodes = [False] * n
     for i in range(n):
         if not visited_nodes[i]:
-            current_scc = [j + 1 for j in range(n) if s_conn_matrix[i][j] == 1]
+            current_scc = [j + 1 for j in iter_bits(scc_bits[i])]
             if current_scc:
                 for node_idx_plus_1 in current_scc:
                     visited_nodes[node_idx_plus_1 - 1] = True
-                sccs.append(sorted(list(set(current_scc))))
+                sccs.append(current_scc)
+    return sccs
+
+def adjacency_lists(adj_matrix):
+    if isinstance(adj_matrix, CSRGraph):
+        return adj_matrix.out_neighbor_view()
+    if adj_matrix and isinstance(adj_matrix[0], int):
+        return [list(iter_bits(bits)) for bits in adj_matrix]
+    return [[j for j, value in enumerate(row) if value == 1] for row in adj_matrix]
+
+def tarjan_strongly_connected_components(adj_matrix):
+    neighbors = adjacency_lists(adj_matrix)
+    n = len(neighbors)
+    index_of = [-1] * n
+    low_link = [0] * n
+    on_stack = [False] * n
+    scc_stack = []
+    sccs = []
+    next_index = 0
+    for root in range(n):
+        if index_of[root] != -1:
+            continue
+        index_of[root] = low_link[root] = next_index
+        next_index += 1
+        scc_stack.append(root)
+        on_stack[root] = True
+        call_stack = [(root, 0)]
+        while call_stack:
+            u, edge_pos = call_stack[-1]
+            u_neighbors = neighbors[u]
+            while edge_pos < len(u_neighbors):
+                v = u_neighbors[edge_pos]
+                edge_pos += 1
+                if index_of[v] == -1:
+                    call_stack[-1] = (u, edge_pos)
+                    index_of[v] = low_link[v] = next_index
+                    next_index += 1
+                    scc_stack.append(v)
+                    on_stack[v] = True
+                    call_stack.append((v, 0))
+                    break
+                if on_stack[v] and index_of[v] < low_link[u]:
+                    low_link[u] = index_of[v]
+            else:
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    if low_link[u] < low_link[parent]:
+                        low_link[parent] = low_link[u]
+                if low_link[u] == index_of[u]:
+                    component = []
+                    while True:
+                        w = scc_stack.pop()
+                        on_stack[w] = False
+                        component.append(w + 1)
+                        if w == u:
+                            break
+                    component.sort()
+                    sccs.append(component)
+    sccs.sort(key=lambda component: component[0])
     return sccs
 
 def build_condensation_graph(original_adj_matrix, scc_list):
@@ -101,12 +446,13 @@ def build_condensation_graph(original_adj_matrix, scc_list):
                        for scc_idx, component_nodes in enumerate(scc_list)
                        for node_val in component_nodes}
     condensation_adj_matrix = [[0] * num_sccs for _ in range(num_sccs)]
-    for u_orig in range(len(original_adj_matrix)):
-        for v_orig in range(len(original_adj_matrix)):
-            if original_adj_matrix[u_orig][v_orig] == 1:
-                scc_u_idx = node_to_scc_map.get(u_orig)
-                scc_v_idx = node_to_scc_map.get(v_orig)
-                if scc_u_idx is not None and scc_v_idx is not None and scc_u_idx != scc_v_idx:
-                    condensation_adj_matrix[scc_u_idx][scc_v_idx] = 1
+    for u_orig, u_neighbors in enumerate(adjacency_lists(original_adj_matrix)):
+        scc_u_idx = node_to_scc_map.get(u_orig)
+        if scc_u_idx is None:
+            continue
+        for v_orig in u_neighbors:
+            scc_v_idx = node_to_scc_map.get(v_orig)
+            if scc_v_idx is not None and scc_u_idx != scc_v_idx:
+                condensation_adj_matrix[scc_u_idx][scc_v_idx] = 1
     scc_labels_for_graph = [",".join(map(str, scc)) for scc in scc_list]
-    return condensation_adj_matrix, scc_labels_for_graph
\ No newline at end of file
+    return condensation_adj_matrix, scc_labels_for_graph
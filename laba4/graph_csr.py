@@ -0,0 +1,224 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+OFFSET_TYPECODE = "q"
+VERTEX_TYPECODE = "i"
+WEIGHT_TYPECODE = "q"
+
+FILE_MAGIC = b"CSRG"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sIqqI4x")
+FLAG_WEIGHTED = 1
+FLAG_IN_INDEX = 2
+
+
+class CSRNeighborView:
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets, targets):
+        self.offsets = offsets
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def __iter__(self):
+        return (self[u] for u in range(len(self)))
+
+
+class CSRGraph:
+    def __init__(self, num_vertices, offsets, targets, weights=None):
+        self.num_vertices = num_vertices
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._targets_view = memoryview(targets)
+        self._in_offsets = None
+        self._in_sources = None
+        self._in_sources_view = None
+        self.mapped_file = None
+
+    @classmethod
+    def from_matrix(cls, matrix, weighted=False):
+        num_vertices = len(matrix)
+        offsets = array(OFFSET_TYPECODE, [0])
+        targets = array(VERTEX_TYPECODE)
+        weights = array(WEIGHT_TYPECODE) if weighted else None
+        for row in matrix:
+            row_targets = [j for j, value in enumerate(row) if value]
+            targets.extend(row_targets)
+            if weighted:
+                weights.extend(row[j] for j in row_targets)
+            offsets.append(len(targets))
+        return cls(num_vertices, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges, weighted=False):
+        buckets = [[] for _ in range(num_vertices)]
+        for edge in edges:
+            buckets[edge[0]].append((edge[1], edge[2]) if weighted else (edge[1], 1))
+        offsets = array(OFFSET_TYPECODE, [0])
+        targets = array(VERTEX_TYPECODE)
+        weights = array(WEIGHT_TYPECODE) if weighted else None
+        for bucket in buckets:
+            bucket.sort()
+            for v, weight in bucket:
+                if len(targets) > offsets[-1] and targets[-1] == v:
+                    continue
+                targets.append(v)
+                if weighted:
+                    weights.append(weight)
+            offsets.append(len(targets))
+        return cls(num_vertices, offsets, targets, weights)
+
+    def symmetrized(self):
+        return CSRGraph.from_edges(self.num_vertices,
+                                   [edge for u, v in self.edges() for edge in ((u, v), (v, u))])
+
+    def to_matrix(self):
+        matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
+        for u in range(self.num_vertices):
+            row = matrix[u]
+            start, end = self.offsets[u], self.offsets[u + 1]
+            for pos in range(start, end):
+                row[self.targets[pos]] = self.weights[pos] if self.weights is not None else 1
+        return matrix
+
+    @property
+    def num_edges(self):
+        return self.offsets[self.num_vertices]
+
+    def out_neighbors(self, u):
+        return self._targets_view[self.offsets[u]:self.offsets[u + 1]]
+
+    def out_neighbor_view(self):
+        return CSRNeighborView(self.offsets, self._targets_view)
+
+    def out_degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def out_degrees(self):
+        offsets = self.offsets
+        return [offsets[u + 1] - offsets[u] for u in range(self.num_vertices)]
+
+    def in_neighbors(self, v):
+        self._build_in_index()
+        return self._in_sources_view[self._in_offsets[v]:self._in_offsets[v + 1]]
+
+    def in_neighbor_view(self):
+        self._build_in_index()
+        return CSRNeighborView(self._in_offsets, self._in_sources_view)
+
+    def in_degree(self, v):
+        self._build_in_index()
+        return self._in_offsets[v + 1] - self._in_offsets[v]
+
+    def in_degrees(self):
+        self._build_in_index()
+        in_offsets = self._in_offsets
+        return [in_offsets[v + 1] - in_offsets[v] for v in range(self.num_vertices)]
+
+    def has_edge(self, u, v):
+        start, end = self.offsets[u], self.offsets[u + 1]
+        pos = bisect_left(self.targets, v, start, end)
+        return pos < end and self.targets[pos] == v
+
+    def edge_weight(self, u, v, default=0):
+        start, end = self.offsets[u], self.offsets[u + 1]
+        pos = bisect_left(self.targets, v, start, end)
+        if pos < end and self.targets[pos] == v:
+            return self.weights[pos] if self.weights is not None else 1
+        return default
+
+    def edges(self):
+        targets = self.targets
+        for u in range(self.num_vertices):
+            for pos in range(self.offsets[u], self.offsets[u + 1]):
+                yield u, targets[pos]
+
+    def weighted_edges(self, upper_only=False):
+        targets = self.targets
+        weights = self.weights
+        for u in range(self.num_vertices):
+            start, end = self.offsets[u], self.offsets[u + 1]
+            if upper_only:
+                start = bisect_left(targets, u + 1, start, end)
+            for pos in range(start, end):
+                yield (weights[pos] if weights is not None else 1), u, targets[pos]
+
+    def _build_in_index(self):
+        if self._in_offsets is not None:
+            return
+        n = self.num_vertices
+        counts = [0] * (n + 1)
+        for v in self.targets:
+            counts[v + 1] += 1
+        for v in range(n):
+            counts[v + 1] += counts[v]
+        in_offsets = array(OFFSET_TYPECODE, counts)
+        in_sources = array(VERTEX_TYPECODE, bytes(in_offsets[n] * array(VERTEX_TYPECODE).itemsize))
+        fill_pos = counts[:n]
+        for u in range(n):
+            for pos in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.targets[pos]
+                in_sources[fill_pos[v]] = u
+                fill_pos[v] += 1
+        self._in_offsets = in_offsets
+        self._in_sources = in_sources
+        self._in_sources_view = memoryview(in_sources)
+
+
+def _aligned(position):
+    return (position + 7) // 8 * 8
+
+
+def save_csr(graph, path, with_in_index=True):
+    flags = 0
+    sections = [graph.offsets, graph.targets]
+    if graph.weights is not None:
+        flags |= FLAG_WEIGHTED
+        sections.append(graph.weights)
+    if with_in_index:
+        graph._build_in_index()
+        flags |= FLAG_IN_INDEX
+        sections.extend((graph._in_offsets, graph._in_sources))
+    with open(path, "wb") as graph_file:
+        graph_file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, graph.num_vertices, graph.num_edges, flags))
+        for section in sections:
+            graph_file.write(b"\0" * (_aligned(graph_file.tell()) - graph_file.tell()))
+            graph_file.write(memoryview(section).cast("B"))
+
+
+def open_csr_mmap(path):
+    with open(path, "rb") as graph_file:
+        mapped = mmap.mmap(graph_file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, num_vertices, num_edges, flags = FILE_HEADER.unpack_from(mapped, 0)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+        mapped.close()
+        raise ValueError(f"Файл {path} не є графом у форматі CSR")
+    buffer = memoryview(mapped)
+    position = FILE_HEADER.size
+
+    def take(typecode, count):
+        nonlocal position
+        position = _aligned(position)
+        size = count * array(typecode).itemsize
+        section = buffer[position:position + size].cast(typecode)
+        position += size
+        return section
+
+    offsets = take(OFFSET_TYPECODE, num_vertices + 1)
+    targets = take(VERTEX_TYPECODE, num_edges)
+    weights = take(WEIGHT_TYPECODE, num_edges) if flags & FLAG_WEIGHTED else None
+    graph = CSRGraph(num_vertices, offsets, targets, weights)
+    if flags & FLAG_IN_INDEX:
+        graph._in_offsets = take(OFFSET_TYPECODE, num_vertices + 1)
+        graph._in_sources = take(VERTEX_TYPECODE, num_edges)
+        graph._in_sources_view = graph._in_sources
+    graph.mapped_file = mapped
+    return graph
@@ -1,4 +1,8 @@
+import math
 import random
+from array import array
+
+from graph_csr import CSRGraph, OFFSET_TYPECODE, VERTEX_TYPECODE
 
 def create_directed_graph_matrix(vertex_count, k_coefficient, random_seed):
     random.seed(random_seed)
@@ -13,6 +17,44 @@ def create_directed_graph_matrix(vertex_count, k_coefficient, random_seed):
         adjacency_matrix.append(current_row)
     return adjacency_matrix
 
+def edge_probability(k_coefficient, low=0.0, high=2.0, threshold=1.0):
+    if k_coefficient <= 0:
+        return 1.0 if threshold <= 0 else 0.0
+    cutoff = (threshold / k_coefficient - low) / (high - low)
+    return min(1.0, max(0.0, 1.0 - cutoff))
+
+def iter_sparse_edges(vertex_count, probability, random_seed):
+    total_cells = vertex_count * vertex_count
+    if probability <= 0.0:
+        return
+    if probability >= 1.0:
+        for cell in range(total_cells):
+            yield divmod(cell, vertex_count)
+        return
+    rng = random.Random(random_seed)
+    log_no_edge = math.log1p(-probability)
+    cell = -1
+    while True:
+        cell += 1 + int(math.log(1.0 - rng.random()) / log_no_edge)
+        if cell >= total_cells:
+            return
+        yield divmod(cell, vertex_count)
+
+def create_sparse_directed_graph(vertex_count, k_coefficient, random_seed, low=0.0, high=2.0, threshold=1.0):
+    probability = edge_probability(k_coefficient, low, high, threshold)
+    offsets = array(OFFSET_TYPECODE, bytes((vertex_count + 1) * array(OFFSET_TYPECODE).itemsize))
+    targets = array(VERTEX_TYPECODE)
+    filled_rows = 0
+    for u, v in iter_sparse_edges(vertex_count, probability, random_seed):
+        while filled_rows <= u:
+            offsets[filled_rows] = len(targets)
+            filled_rows += 1
+        targets.append(v)
+    while filled_rows <= vertex_count:
+        offsets[filled_rows] = len(targets)
+        filled_rows += 1
+    return CSRGraph(vertex_count, offsets, targets)
+
 def convert_to_undirected_graph(directed_matrix):
     size = len(directed_matrix)
     undirected_matrix = [[0 for _ in range(size)] for _ in range(size)]
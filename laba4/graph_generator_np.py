@@ -0,0 +1,95 @@
+import math
+import random
+from array import array
+
+import numpy as np
+
+from graph_csr import CSRGraph, OFFSET_TYPECODE, VERTEX_TYPECODE
+
+MODE_COMPATIBLE = "compatible"
+MODE_FAST = "fast"
+CHUNK_CELLS = 1 << 22
+RAW_DRAW_RANGE = 1 << 32
+
+
+def _compatible_random_state(random_seed):
+    random.seed(random_seed)
+    _, internal_state, _ = random.getstate()
+    random_state = np.random.RandomState()
+    random_state.set_state(("MT19937", np.array(internal_state[:-1], dtype=np.uint32), internal_state[-1]))
+    return random_state
+
+
+def _chunk_rows(vertex_count):
+    return max(1, CHUNK_CELLS // max(1, vertex_count))
+
+
+def iter_uniform_row_chunks(vertex_count, random_seed, low=0.0, high=2.0):
+    draw = _compatible_random_state(random_seed).random_sample
+    chunk_rows = _chunk_rows(vertex_count)
+    span = high - low
+    for row_start in range(0, vertex_count, chunk_rows):
+        values = draw((min(chunk_rows, vertex_count - row_start), vertex_count))
+        values *= span
+        values += low
+        yield row_start, values
+
+
+def _fast_draw_cutoff(k_coefficient, low, high, threshold):
+    if k_coefficient <= 0:
+        return math.inf if threshold > 0 else -math.inf
+    return (threshold / k_coefficient - low) / (high - low)
+
+
+def _fast_raw_cutoff(cutoff):
+    if cutoff <= 0:
+        return 0
+    if cutoff >= 1:
+        return RAW_DRAW_RANGE
+    return math.ceil(cutoff * RAW_DRAW_RANGE)
+
+
+def create_directed_graph_matrix(vertex_count, k_coefficient, random_seed, mode=MODE_COMPATIBLE,
+                                 low=0.0, high=2.0, threshold=1.0, as_array=False):
+    adjacency_matrix = np.empty((vertex_count, vertex_count), dtype=np.uint8)
+    if mode == MODE_COMPATIBLE:
+        for row_start, values in iter_uniform_row_chunks(vertex_count, random_seed, low, high):
+            values *= k_coefficient
+            np.greater_equal(values, threshold, out=adjacency_matrix[row_start:row_start + len(values)],
+                             casting="unsafe")
+    elif mode == MODE_FAST:
+        raw_cutoff = _fast_raw_cutoff(_fast_draw_cutoff(k_coefficient, low, high, threshold))
+        if raw_cutoff in (0, RAW_DRAW_RANGE):
+            adjacency_matrix.fill(raw_cutoff == 0)
+        else:
+            draw_raw = np.random.default_rng(random_seed).bit_generator.random_raw
+            chunk_rows = _chunk_rows(vertex_count)
+            for row_start in range(0, vertex_count, chunk_rows):
+                rows = min(chunk_rows, vertex_count - row_start)
+                cells = rows * vertex_count
+                draws = draw_raw((cells + 1) // 2).view(np.uint32)[:cells].reshape(rows, vertex_count)
+                np.greater_equal(draws, np.uint32(raw_cutoff), out=adjacency_matrix[row_start:row_start + rows],
+                                 casting="unsafe")
+    else:
+        raise ValueError(f"Невідомий режим генерації: {mode}")
+    return adjacency_matrix if as_array else adjacency_matrix.tolist()
+
+
+def convert_to_undirected_graph(directed_matrix, keep_loops=True, as_array=False):
+    directed = np.asarray(directed_matrix, dtype=bool)
+    undirected = directed | directed.T
+    if not keep_loops:
+        np.fill_diagonal(undirected, False)
+    undirected = undirected.astype(np.uint8)
+    return undirected if as_array else undirected.tolist()
+
+
+def to_csr_graph(adjacency_matrix):
+    adjacency = np.asarray(adjacency_matrix, dtype=bool)
+    vertex_count = len(adjacency)
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.count_nonzero(adjacency, axis=1), out=offsets[1:])
+    targets = np.nonzero(adjacency)[1].astype(np.int32)
+    return CSRGraph(vertex_count,
+                    array(OFFSET_TYPECODE, offsets.tobytes()),
+                    array(VERTEX_TYPECODE, targets.tobytes()))
@@ -13,6 +13,8 @@ N4_VAL = 0
 K_PART1 = 1.0 - N3_VAL * 0.01 - N4_VAL * 0.01 - 0.3
 K_PART2 = 1.0 - N3_VAL * 0.005 - N4_VAL * 0.005 - 0.27
 
+PATHS_PRINT_LIMIT = None
+
 VIZ_CIRCLE_RADIUS = 225
 VIZ_VERTEX_SIZE = 16
 VIZ_WINDOW_WIDTH = 610
@@ -109,21 +111,16 @@ def main():
     print("-----------------------")
     for i in range(N): print(f"{i + 1:^7} | {dir_out_deg2[i]:^5} | {dir_in_deg2[i]:^5}")
 
-    paths_len2 = analyze.find_paths_of_length(adj_matrix_dir2, 2)
-    print(f"\nШляхи довжини 2 в Adir2 (знайдено {len(paths_len2)}):")
-    if paths_len2:
-        for p in paths_len2:
-            print(p)
-    else:
-        print("Немає шляхів довжини 2.")
-
-    paths_len3 = analyze.find_paths_of_length(adj_matrix_dir2, 3)
-    print(f"\nШляхи довжини 3 в Adir2 (знайдено {len(paths_len3)}):")
-    if paths_len3:
-        for p in paths_len3:
-            print(p)
-    else:
-        print("Немає шляхів довжини 3.")
+    for path_length in (2, 3):
+        total_paths = analyze.count_total_paths_of_length(adj_matrix_dir2, path_length)
+        print(f"\nШляхи довжини {path_length} в Adir2 (знайдено {total_paths}):")
+        if total_paths:
+            for p in analyze.find_paths_of_length(adj_matrix_dir2, path_length, PATHS_PRINT_LIMIT):
+                print(p)
+            if PATHS_PRINT_LIMIT is not None and total_paths > PATHS_PRINT_LIMIT:
+                print(f"... (показано перші {PATHS_PRINT_LIMIT})")
+        else:
+            print(f"Немає шляхів довжини {path_length}.")
 
     reach_matrix2 = analyze.warshall_reachability_matrix(adj_matrix_dir2)
     gen.display_matrix(reach_matrix2, "Матриця досяжності R для Adir2")
@@ -131,7 +128,7 @@ def main():
     s_conn_matrix2 = analyze.strong_connectivity_matrix(reach_matrix2)
     gen.display_matrix(s_conn_matrix2, "Матриця сильної зв'язності S для Adir2")
 
-    scc_list2 = analyze.find_strongly_connected_components(s_conn_matrix2)
+    scc_list2 = analyze.tarjan_strongly_connected_components(adj_matrix_dir2)
     print("\nКомпоненти сильної зв'язності для Adir2:")
     if scc_list2:
         for i, component in enumerate(scc_list2): print(f"Компонента {i + 1}: {component}")
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import graph_analyzer as analyze
+import graph_generator as gen
+import graph_generator_np as gen_np
+
+
+@pytest.mark.parametrize("vertex_count, k_coefficient", [(11, 0.69), (11, 0.725), (40, 0.6), (0, 0.7)])
+def test_compatible_mode_is_drop_in_for_analyzers(vertex_count, k_coefficient, capsys):
+    expected = gen.create_directed_graph_matrix(vertex_count, k_coefficient, 4310)
+    generated = gen_np.create_directed_graph_matrix(vertex_count, k_coefficient, 4310)
+    assert generated == expected
+
+    assert (analyze.tarjan_strongly_connected_components(generated)
+            == analyze.tarjan_strongly_connected_components(expected))
+    assert analyze.warshall_reachability_matrix(generated) == analyze.warshall_reachability_matrix(expected)
+    assert analyze.count_paths_of_length(generated, 2) == analyze.count_paths_of_length(expected, 2)
+
+    undirected = gen_np.convert_to_undirected_graph(generated)
+    assert undirected == gen.convert_to_undirected_graph(expected)
+    assert analyze.calculate_undirected_degrees(undirected) == analyze.calculate_undirected_degrees(
+        gen.convert_to_undirected_graph(expected))
+
+    gen.display_matrix(generated)
+    generated_output = capsys.readouterr().out
+    gen.display_matrix(expected)
+    assert generated_output == capsys.readouterr().out
+
+
+def test_as_array_returns_matrix_for_csr_conversion():
+    generated = gen_np.create_directed_graph_matrix(25, 0.7, 4310, as_array=True)
+    assert isinstance(generated, np.ndarray) and generated.dtype == np.uint8
+    graph = gen_np.to_csr_graph(generated)
+    assert graph.to_matrix() == generated.tolist()
+
+
+def test_fast_mode_edge_density():
+    generated = gen_np.create_directed_graph_matrix(400, 0.7, 4310, mode=gen_np.MODE_FAST, as_array=True)
+    assert abs(generated.mean() - (1 - 1 / 0.7 / 2)) < 0.01
+    assert gen_np.create_directed_graph_matrix(3, 0.0, 4310, mode=gen_np.MODE_FAST) == [[0] * 3] * 3
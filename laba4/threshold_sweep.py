@@ -0,0 +1,145 @@
+import random
+
+import graph_analyzer as analyze
+
+SWEEP_SEED = 4310
+SWEEP_N = 11
+SWEEP_K_VALUES = [0.50 + 0.02 * step for step in range(26)]
+
+
+class IncrementalReachability:
+    def __init__(self, num_vertices):
+        self.num_vertices = num_vertices
+        self.reach_bits = [1 << i for i in range(num_vertices)]
+        self.reached_by_bits = [1 << i for i in range(num_vertices)]
+        self.reachable_pairs = num_vertices
+        self.component_root = list(range(num_vertices))
+        self.component_members = [[i] for i in range(num_vertices)]
+        self.root_bits = (1 << num_vertices) - 1
+        self.scc_count = num_vertices
+        self.largest_scc = 1 if num_vertices else 0
+        self.out_arcs = [set() for _ in range(num_vertices)]
+        self.in_arcs = [set() for _ in range(num_vertices)]
+        self.condensation_edges = 0
+
+    def add_edge(self, u, v):
+        reach_changed = not (self.reach_bits[u] >> v) & 1
+        if reach_changed:
+            sources = self.reached_by_bits[u]
+            targets = self.reach_bits[v]
+            for x in analyze.iter_bits(sources):
+                old_bits = self.reach_bits[x]
+                self.reach_bits[x] = old_bits | targets
+                self.reachable_pairs += self.reach_bits[x].bit_count() - old_bits.bit_count()
+            for y in analyze.iter_bits(targets):
+                self.reached_by_bits[y] |= sources
+        self._add_arc(self.component_root[u], self.component_root[v])
+        if reach_changed and (self.reach_bits[v] >> u) & 1:
+            self._merge_components(self.component_of(u))
+        return reach_changed
+
+    def component_of(self, vertex):
+        return self.reach_bits[vertex] & self.reached_by_bits[vertex]
+
+    def _add_arc(self, root_u, root_v):
+        if root_u != root_v and root_v not in self.out_arcs[root_u]:
+            self.out_arcs[root_u].add(root_v)
+            self.in_arcs[root_v].add(root_u)
+            self.condensation_edges += 1
+
+    def _merge_components(self, component_bits):
+        roots = list(analyze.iter_bits(component_bits & self.root_bits))
+        keeper = max(roots, key=lambda root: len(self.component_members[root]))
+        for root in roots:
+            if root != keeper:
+                self._merge_into(keeper, root)
+        self.largest_scc = max(self.largest_scc, len(self.component_members[keeper]))
+
+    def _merge_into(self, keeper, root):
+        members = self.component_members[root]
+        for vertex in members:
+            self.component_root[vertex] = keeper
+        self.component_members[keeper].extend(members)
+        self.component_members[root] = None
+        self.root_bits ^= 1 << root
+        self.scc_count -= 1
+
+        for target in self.out_arcs[root]:
+            self.in_arcs[target].discard(root)
+            self.condensation_edges -= 1
+            if target != keeper:
+                self._add_arc(keeper, target)
+        for source in self.in_arcs[root]:
+            self.out_arcs[source].discard(root)
+            self.condensation_edges -= 1
+            if source != keeper:
+                self._add_arc(source, keeper)
+        self.out_arcs[root] = self.in_arcs[root] = None
+
+
+def draw_cell_values(vertex_count, random_seed, low=0.0, high=2.0):
+    random.seed(random_seed)
+    return [random.uniform(low, high) for _ in range(vertex_count * vertex_count)]
+
+
+def sweep_thresholds(vertex_count, random_seed, k_values, low=0.0, high=2.0, threshold=1.0):
+    values = draw_cell_values(vertex_count, random_seed, low, high)
+    cell_order = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+    directed_degrees = analyze.DegreeTracker(vertex_count, directed=True)
+    undirected_degrees = analyze.DegreeTracker(vertex_count, directed=False)
+    reachability = IncrementalReachability(vertex_count)
+    next_cell = 0
+    for k_coefficient in sorted(k_values):
+        while next_cell < len(cell_order) and values[cell_order[next_cell]] * k_coefficient >= threshold:
+            u, v = divmod(cell_order[next_cell], vertex_count)
+            next_cell += 1
+            directed_degrees.add_edge(u, v)
+            undirected_degrees.add_edge(u, v)
+            reachability.add_edge(u, v)
+
+        directed_regular, directed_regular_degree = directed_degrees.check_regularity()
+        undirected_regular, undirected_regular_degree = undirected_degrees.check_regularity()
+        yield {
+            "k": k_coefficient,
+            "edges": directed_degrees.num_edges,
+            "directed": {
+                "min_degree": directed_degrees.min_degree,
+                "max_degree": directed_degrees.max_degree,
+                "regular": directed_regular,
+                "regular_degree": directed_regular_degree,
+                "pendant": directed_degrees.pendant_count,
+                "isolated": directed_degrees.isolated_count,
+            },
+            "undirected": {
+                "edges": undirected_degrees.num_edges,
+                "min_degree": undirected_degrees.min_degree,
+                "max_degree": undirected_degrees.max_degree,
+                "regular": undirected_regular,
+                "regular_degree": undirected_regular_degree,
+                "pendant": undirected_degrees.pendant_count,
+                "isolated": undirected_degrees.isolated_count,
+            },
+            "reachable_pairs": reachability.reachable_pairs,
+            "scc_count": reachability.scc_count,
+            "largest_scc": reachability.largest_scc,
+            "condensation_edges": reachability.condensation_edges,
+        }
+
+
+def print_sweep_report(records):
+    print(f"{'k':^7} | {'Дуги':^6} | {'Досяжні пари':^12} | {'КСЗ':^5} | {'Найб. КСЗ':^9} | "
+          f"{'Дуги конд.':^10} | {'Висячі':^6} | {'Ізольов.':^8}")
+    print("-" * 86)
+    for record in records:
+        print(f"{record['k']:^7.3f} | {record['edges']:^6} | {record['reachable_pairs']:^12} | "
+              f"{record['scc_count']:^5} | {record['largest_scc']:^9} | {record['condensation_edges']:^10} | "
+              f"{record['directed']['pendant']:^6} | {record['directed']['isolated']:^8}")
+
+
+def main():
+    print(f"--- Перебір k для варіанту {SWEEP_SEED}, N={SWEEP_N} ---")
+    print_sweep_report(sweep_thresholds(SWEEP_N, SWEEP_SEED, SWEEP_K_VALUES))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
 import tkinter as tk
 import math
 import random
-from datetime import datetime
 from collections import deque
+from itertools import islice
+from datetime import datetime
+from tkinter import filedialog
+
+from autoplay import AutoPlayer, AUTOPLAY_DEFAULT_SPEED, AUTOPLAY_MIN_SPEED, AUTOPLAY_MAX_SPEED
+from graph_csr import CSRGraph
+from traversal import (TraversalEngine, EVENT_START_COMPONENT, EVENT_DISCOVER, EVENT_PROCESS_START,
+                       EVENT_PROCESS_FINISH, EVENT_ALREADY_KNOWN, EVENT_NODE_STATES, NODE_STATE_UNCHANGED,
+                       NO_PARENT, load_recording, save_recording)
 
 VARIANT_N1N2N3N4 = 4310
 N_STR = str(VARIANT_N1N2N3N4).zfill(4)
@@ -11,6 +19,8 @@ N4 = int(N_STR[3])
 K_COEFFICIENT = 1.0 - N3 * 0.01 - N4 * 0.005 - 0.15
 
 N_VERTICES = 11
+PRINT_DENSE_TREE = True
+VECTOR_PRINT_LIMIT = 50
 CIRCLE_RADIUS = 225
 VERTEX_SIZE = 16
 
@@ -28,6 +38,13 @@ COLOR_PROCESSING_NODE = "orange"
 COLOR_VISITED_NODE = "lightgreen"
 COLOR_DEFAULT_EDGE = "blue"
 COLOR_TREE_EDGE = "red"
+NODE_STATE_COLORS = (COLOR_DEFAULT_NODE, COLOR_DISCOVERED_NODE, COLOR_PROCESSING_NODE, COLOR_VISITED_NODE)
+
+PROTOCOL_MAX_LINES = 2000
+PROTOCOL_FLUSH_MS = 16
+PROTOCOL_LOG_PATH = None
+SCRUB_PROTOCOL_EVENTS = 30
+TRAVERSAL_LOG_FILETYPES = [("Журнал обходу", "*.trvl"), ("Усі файли", "*")]
 
 
 def create_directed_graph_matrix(vertex_count, coefficient_k, seed_val):
@@ -79,6 +96,16 @@ def display_matrix(matrix, description="Матриця графа"):
         print(row_str)
 
 
+def display_vertex_vector(vertices, description, limit=VECTOR_PRINT_LIMIT):
+    print(f"\n--- {description} ---")
+    if not vertices:
+        print("Вектор порожній.")
+        return
+    shown_values = " ".join(str(vertex + 1) for vertex in vertices[:limit])
+    hidden_count = len(vertices) - limit
+    print(shown_values + (f" ... (ще {hidden_count})" if hidden_count > 0 else ""))
+
+
 def draw_arrow(canvas, x1, y1, x2, y2, arrow_size=10, color="blue", offset=0):
     angle = math.atan2(y2 - y1, x2 - x1)
     _x1, _y1, _x2, _y2 = x1, y1, x2, y2
@@ -89,14 +116,15 @@ def draw_arrow(canvas, x1, y1, x2, y2, arrow_size=10, color="blue", offset=0):
         _y1 += perp_y;
         _x2 += perp_x;
         _y2 += perp_y
-    canvas.create_line(_x1, _y1, _x2, _y2, fill=color, width=1, tags="edge_item")
+    line_item = canvas.create_line(_x1, _y1, _x2, _y2, fill=color, width=1, tags="edge_item")
     actual_angle_for_head = math.atan2(_y2 - _y1, _x2 - _x1)
     arrow_x1_tip = _x2 - arrow_size * math.cos(actual_angle_for_head - math.pi / 6)
     arrow_y1_tip = _y2 - arrow_size * math.sin(actual_angle_for_head - math.pi / 6)
     arrow_x2_tip = _x2 - arrow_size * math.cos(actual_angle_for_head + math.pi / 6)
     arrow_y2_tip = _y2 - arrow_size * math.sin(actual_angle_for_head + math.pi / 6)
-    canvas.create_line(_x2, _y2, arrow_x1_tip, arrow_y1_tip, fill=color, width=1, tags="edge_item")
-    canvas.create_line(_x2, _y2, arrow_x2_tip, arrow_y2_tip, fill=color, width=1, tags="edge_item")
+    head_item1 = canvas.create_line(_x2, _y2, arrow_x1_tip, arrow_y1_tip, fill=color, width=1, tags="edge_item")
+    head_item2 = canvas.create_line(_x2, _y2, arrow_x2_tip, arrow_y2_tip, fill=color, width=1, tags="edge_item")
+    return line_item, head_item1, head_item2
 
 
 def draw_self_loop(canvas, x, y, angle, loop_radius=45, arrow_size=10, color="blue"):
@@ -109,15 +137,16 @@ def draw_self_loop(canvas, x, y, angle, loop_radius=45, arrow_size=10, color="bl
     end_angle_rad = angle + 0.6;
     end_x = x + VERTEX_SIZE * math.cos(end_angle_rad);
     end_y = y + VERTEX_SIZE * math.sin(end_angle_rad)
-    canvas.create_line(start_x, start_y, control_point1_x, control_point1_y, control_point2_x, control_point2_y, end_x,
-                       end_y, smooth=True, fill=color, width=1, tags="edge_item")
+    loop_item = canvas.create_line(start_x, start_y, control_point1_x, control_point1_y, control_point2_x,
+                                   control_point2_y, end_x, end_y, smooth=True, fill=color, width=1, tags="edge_item")
     arrow_head_angle = math.atan2(end_y - control_point2_y, end_x - control_point2_x)
     arrow_x1_tip = end_x - arrow_size * math.cos(arrow_head_angle - math.pi / 6);
     arrow_y1_tip = end_y - arrow_size * math.sin(arrow_head_angle - math.pi / 6)
     arrow_x2_tip = end_x - arrow_size * math.cos(arrow_head_angle + math.pi / 6);
     arrow_y2_tip = end_y - arrow_size * math.sin(arrow_head_angle + math.pi / 6)
-    canvas.create_line(end_x, end_y, arrow_x1_tip, arrow_y1_tip, fill=color, width=1, tags="edge_item")
-    canvas.create_line(end_x, end_y, arrow_x2_tip, arrow_y2_tip, fill=color, width=1, tags="edge_item")
+    head_item1 = canvas.create_line(end_x, end_y, arrow_x1_tip, arrow_y1_tip, fill=color, width=1, tags="edge_item")
+    head_item2 = canvas.create_line(end_x, end_y, arrow_x2_tip, arrow_y2_tip, fill=color, width=1, tags="edge_item")
+    return loop_item, head_item1, head_item2
 
 
 def visualize_directed_graph(canvas, vertex_count, adjacency_matrix, node_colors_override=None,
@@ -125,6 +154,8 @@ def visualize_directed_graph(canvas, vertex_count, adjacency_matrix, node_colors
     if node_colors_override is None: node_colors_override = [COLOR_DEFAULT_NODE] * vertex_count
     if edge_colors_override is None: edge_colors_override = {}
     vertex_positions = calculate_vertex_positions(CIRCLE_RADIUS, vertex_count, WINDOW_CENTER_X_LR5, WINDOW_CENTER_Y_LR5)
+    node_item_ids = []
+    edge_item_ids = {}
     bidirectional_edges_set = set()
     if adjacency_matrix and len(adjacency_matrix) == vertex_count and all(
             len(row) == vertex_count for row in adjacency_matrix):
@@ -141,7 +172,8 @@ def visualize_directed_graph(canvas, vertex_count, adjacency_matrix, node_colors
                         if i_from == j_to:
                             x_loop, y_loop = vertex_positions[i_from];
                             angle_loop = -math.pi / 2 + 2 * math.pi * i_from / vertex_count
-                            draw_self_loop(canvas, x_loop, y_loop, angle_loop, color=edge_current_color)
+                            edge_item_ids[(i_from, j_to)] = draw_self_loop(canvas, x_loop, y_loop, angle_loop,
+                                                                           color=edge_current_color)
                         else:
                             x1_center, y1_center = vertex_positions[i_from];
                             x2_center, y2_center = vertex_positions[j_to]
@@ -155,29 +187,100 @@ def visualize_directed_graph(canvas, vertex_count, adjacency_matrix, node_colors
                             end_y_edge = y2_center - VERTEX_SIZE * delta_y / distance
                             is_bidirectional_flag = (min(i_from, j_to), max(i_from, j_to)) in bidirectional_edges_set
                             current_offset_val = 8 if is_bidirectional_flag else 0
-                            draw_arrow(canvas, start_x_edge, start_y_edge, end_x_edge, end_y_edge,
-                                       color=edge_current_color, offset=current_offset_val)
+                            edge_item_ids[(i_from, j_to)] = draw_arrow(canvas, start_x_edge, start_y_edge,
+                                                                       end_x_edge, end_y_edge,
+                                                                       color=edge_current_color,
+                                                                       offset=current_offset_val)
     for i_vtx, (x_vtx, y_vtx) in enumerate(vertex_positions):
-        canvas.create_oval(x_vtx - VERTEX_SIZE, y_vtx - VERTEX_SIZE, x_vtx + VERTEX_SIZE, y_vtx + VERTEX_SIZE,
-                           fill=node_colors_override[i_vtx], outline="navy", tags=f"node_{i_vtx}")
+        node_item_ids.append(canvas.create_oval(x_vtx - VERTEX_SIZE, y_vtx - VERTEX_SIZE, x_vtx + VERTEX_SIZE,
+                                                y_vtx + VERTEX_SIZE, fill=node_colors_override[i_vtx], outline="navy",
+                                                tags=f"node_{i_vtx}"))
         canvas.create_text(x_vtx, y_vtx, text=str(i_vtx + 1), fill="black", font=("Arial", 10, "bold"))
+    return node_item_ids, edge_item_ids
+
+
+class ProtocolLog:
+    def __init__(self, text_widget, max_lines=PROTOCOL_MAX_LINES, log_path=None):
+        self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.recent_lines = deque(maxlen=max_lines)
+        self.pending_lines = []
+        self.widget_line_count = 0
+        self.flush_scheduled = False
+        self.log_file = open(log_path, "w", encoding="utf-8") if log_path else None
+
+    def append(self, message):
+        self.recent_lines.append(message)
+        self.pending_lines.append(message)
+        if self.log_file:
+            self.log_file.write(message + "\n")
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.text_widget.after(PROTOCOL_FLUSH_MS, self.flush)
+
+    def flush(self):
+        self.flush_scheduled = False
+        if not self.pending_lines:
+            return
+        if len(self.pending_lines) >= self.max_lines:
+            self.text_widget.delete('1.0', tk.END)
+            self.widget_line_count = 0
+            del self.pending_lines[:-self.max_lines]
+        self.text_widget.insert(tk.END, "\n".join(self.pending_lines) + "\n")
+        self.widget_line_count += len(self.pending_lines)
+        self.pending_lines.clear()
+        excess_lines = self.widget_line_count - self.max_lines
+        if excess_lines > 0:
+            self.text_widget.delete('1.0', f"{excess_lines + 1}.0")
+            self.widget_line_count = self.max_lines
+        self.text_widget.see(tk.END)
+        if self.log_file:
+            self.log_file.flush()
+
+    def clear(self):
+        self.text_widget.delete('1.0', tk.END)
+        self.recent_lines.clear()
+        self.pending_lines.clear()
+        self.widget_line_count = 0
+
+    def last_lines(self, count):
+        return list(islice(reversed(self.recent_lines), count))[::-1]
+
+    def close(self):
+        self.flush()
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
 
 
 class GraphApp:
-    def __init__(self, master_window, adj_matrix_data):
+    def __init__(self, master_window, adj_matrix_data, protocol_log_path=PROTOCOL_LOG_PATH, dense_tree_output=False):
         self.master = master_window
-        self.adj_matrix = adj_matrix_data
-        self.num_vertices = len(adj_matrix_data)
+        self.dense_tree_output = dense_tree_output
+        if isinstance(adj_matrix_data, CSRGraph):
+            self.graph = adj_matrix_data
+            self.adj_matrix = adj_matrix_data.to_matrix()
+        else:
+            self.graph = CSRGraph.from_matrix(adj_matrix_data)
+            self.adj_matrix = adj_matrix_data
+        self.num_vertices = self.graph.num_vertices
+        self.engine = TraversalEngine(self.graph)
         self.node_colors = [COLOR_DEFAULT_NODE] * self.num_vertices
-        self.tree_edges = set()
-        self.visited_globally = [False] * self.num_vertices
-        self.current_traversal_gen = None
+        self.recording = None
+        self.step_position = 0
+        self.tree_edge_count = 0
+        self.order_count = 0
+        self.traversal_finished = False
         self.active_traversal_name = None
-
-        self.discovery_order_list = []
-        self.node_new_numbering = {}
+        self.title_item = None
+        self.node_item_ids = []
+        self.edge_item_ids = {}
 
         self.setup_gui()
+        self.protocol_log = ProtocolLog(self.protocol_text_widget, log_path=protocol_log_path)
+        self.autoplayer = AutoPlayer(self.master, self.execute_next_step,
+                                     lambda: self.next_step_button['state'] == tk.NORMAL,
+                                     on_stop=self.on_autoplay_stopped)
         self.redraw_graph_canvas()
 
     def setup_gui(self):
@@ -197,6 +300,27 @@ class GraphApp:
         self.next_step_button.pack(side=tk.LEFT, padx=5)
         self.reset_button = tk.Button(controls_frame, text="Reset", command=self.reset_traversal_state);
         self.reset_button.pack(side=tk.LEFT, padx=5)
+        self.autoplay_button = tk.Button(controls_frame, text="Auto Play", command=self.toggle_autoplay,
+                                         state=tk.DISABLED);
+        self.autoplay_button.pack(side=tk.LEFT, padx=5)
+        self.speed_scale = tk.Scale(controls_frame, from_=AUTOPLAY_MIN_SPEED, to=AUTOPLAY_MAX_SPEED,
+                                    orient=tk.HORIZONTAL, label="Кроків/с", length=160,
+                                    command=lambda value: self.autoplayer.set_speed(value));
+        self.speed_scale.set(AUTOPLAY_DEFAULT_SPEED)
+        self.speed_scale.pack(side=tk.LEFT, padx=5)
+        playback_frame = tk.Frame(self.master);
+        playback_frame.pack(fill=tk.X, pady=5)
+        self.step_back_button = tk.Button(playback_frame, text="Step Back", command=self.execute_previous_step,
+                                          state=tk.DISABLED);
+        self.step_back_button.pack(side=tk.LEFT, padx=5)
+        self.scrub_scale = tk.Scale(playback_frame, from_=0, to=0, orient=tk.HORIZONTAL, label="Крок", length=300,
+                                    command=lambda value: self.jump_to_step(int(float(value))));
+        self.scrub_scale.pack(side=tk.LEFT, padx=5)
+        self.save_log_button = tk.Button(playback_frame, text="Save Log", command=self.save_traversal_log,
+                                         state=tk.DISABLED);
+        self.save_log_button.pack(side=tk.LEFT, padx=5)
+        self.load_log_button = tk.Button(playback_frame, text="Load Log", command=self.load_traversal_log);
+        self.load_log_button.pack(side=tk.LEFT, padx=5)
         self.graph_canvas = tk.Canvas(self.master, width=WINDOW_WIDTH_LR5, height=BASE_CANVAS_HEIGHT, bg="white",
                                       borderwidth=1, relief="solid");
         self.graph_canvas.pack(padx=10, pady=5)
@@ -214,60 +338,82 @@ class GraphApp:
     def execute_next_step_if_active(self):
         if self.next_step_button['state'] == tk.NORMAL: self.execute_next_step()
 
+    def toggle_autoplay(self):
+        self.autoplayer.toggle()
+        if self.autoplayer.running:
+            self.autoplay_button.config(text="Pause")
+            self.update_status_message(f"{self.active_traversal_name}: Автовідтворення.")
+
+    def on_autoplay_stopped(self):
+        self.autoplay_button.config(text="Auto Play")
+
     def add_to_protocol(self, message):
-        self.protocol_text_widget.insert(tk.END, message + "\n");
-        self.protocol_text_widget.see(tk.END)
+        self.protocol_log.append(message)
 
     def update_status_message(self, message):
         self.status_label.config(text=f"Статус: {message}")
 
+    def canvas_title(self):
+        return f"Напрямлений граф (Обхід: {self.active_traversal_name or 'немає'})"
+
     def redraw_graph_canvas(self):
         self.graph_canvas.delete("all")
-        self.graph_canvas.create_text(WINDOW_WIDTH_LR5 / 2, 20,
-                                      text=f"Напрямлений граф (Обхід: {self.active_traversal_name or 'немає'})",
-                                      font=("Arial", 14, "bold"))
+        self.title_item = self.graph_canvas.create_text(WINDOW_WIDTH_LR5 / 2, 20, text=self.canvas_title(),
+                                                        font=("Arial", 14, "bold"))
         current_edge_colors = {}
-        for u_edge, v_edge in self.tree_edges: current_edge_colors[(u_edge, v_edge)] = COLOR_TREE_EDGE
-        visualize_directed_graph(self.graph_canvas, self.num_vertices, self.adj_matrix,
-                                 node_colors_override=self.node_colors, edge_colors_override=current_edge_colors)
+        for u_edge, v_edge in self.shown_tree_edges(): current_edge_colors[(u_edge, v_edge)] = COLOR_TREE_EDGE
+        self.node_item_ids, self.edge_item_ids = visualize_directed_graph(
+            self.graph_canvas, self.num_vertices, self.adj_matrix,
+            node_colors_override=self.node_colors, edge_colors_override=current_edge_colors)
+
+    def update_canvas_title(self):
+        self.graph_canvas.itemconfig(self.title_item, text=self.canvas_title())
+
+    def set_node_color(self, node, color):
+        if self.node_colors[node] != color:
+            self.node_colors[node] = color
+            self.graph_canvas.itemconfig(self.node_item_ids[node], fill=color)
+
+    def set_edge_color(self, u, v, color):
+        for item_id in self.edge_item_ids.get((u, v), ()):
+            self.graph_canvas.itemconfig(item_id, fill=color)
+
+    def shown_tree_edges(self):
+        return self.recording.tree_edges[:self.tree_edge_count] if self.recording else []
+
+    def update_playback_controls(self):
+        forward_state = tk.NORMAL if self.recording is not None and not self.traversal_finished else tk.DISABLED
+        self.next_step_button.config(state=forward_state)
+        self.autoplay_button.config(state=forward_state)
+        self.step_back_button.config(state=tk.NORMAL if self.step_position > 0 else tk.DISABLED)
+        self.save_log_button.config(state=tk.NORMAL if self.recording is not None else tk.DISABLED)
+        self.scrub_scale.config(to=len(self.recording) if self.recording else 0)
+        self.scrub_scale.set(self.step_position)
 
     def find_start_node_for_traversal(self, for_new_component=False):
-        for i in range(self.num_vertices):
-            has_outgoing = any(self.adj_matrix[i][j] == 1 for j in range(self.num_vertices))
-            if has_outgoing:
-                if for_new_component:
-                    if not self.visited_globally[i]: return i
-                else:
-                    return i
-        return -1
+        return self.engine.find_start_node(for_new_component)
 
     def reset_traversal_state(self):
-        current_protocol_content = self.protocol_text_widget.get('1.0', tk.END)
-        if "--- Скидання стану обходу ---" not in current_protocol_content.splitlines()[
-                                                  -2:]:
-            self.protocol_text_widget.delete('1.0', tk.END)
+        if "--- Скидання стану обходу ---" not in self.protocol_log.last_lines(1):
+            self.protocol_log.clear()
             self.add_to_protocol("--- Скидання стану обходу ---")
 
-        self.node_colors = [COLOR_DEFAULT_NODE] * self.num_vertices
-        self.tree_edges.clear()
-        self.visited_globally = [False] * self.num_vertices
-        self.discovery_order_list = []
-        self.node_new_numbering = {}
-        if self.current_traversal_gen:
-            try:
-                self.current_traversal_gen.close()
-            except GeneratorExit:
-                pass
-            self.current_traversal_gen = None
+        self.autoplayer.pause()
+        for u_edge, v_edge in self.shown_tree_edges(): self.set_edge_color(u_edge, v_edge, COLOR_DEFAULT_EDGE)
+        for node in range(self.num_vertices): self.set_node_color(node, COLOR_DEFAULT_NODE)
+        self.engine.reset()
+        self.recording = None
+        self.step_position = self.tree_edge_count = self.order_count = 0
+        self.traversal_finished = False
         self.active_traversal_name = None
         self.bfs_button.config(state=tk.NORMAL);
         self.dfs_button.config(state=tk.NORMAL)
-        self.next_step_button.config(state=tk.DISABLED)
+        self.update_playback_controls()
         self.update_status_message("Готовий до нового обходу")
-        self.redraw_graph_canvas()
+        self.update_canvas_title()
 
-    def _init_traversal(self, traversal_name, generator_func):
-        self.protocol_text_widget.delete('1.0', tk.END)
+    def _init_traversal(self, traversal_name):
+        self.protocol_log.clear()
         self.reset_traversal_state()
         self.active_traversal_name = traversal_name
         self.add_to_protocol(f"--- Розпочато {traversal_name} ---")
@@ -280,153 +426,168 @@ class GraphApp:
             self.active_traversal_name = None;
             return False
         self.add_to_protocol(f"{traversal_name}: Старт з вершини {start_node + 1}.")
-        self.current_traversal_gen = generator_func(start_node)
+        self.recording = self.engine.record(traversal_name)
+        self.update_canvas_title()
         self.bfs_button.config(state=tk.DISABLED);
         self.dfs_button.config(state=tk.DISABLED)
-        self.next_step_button.config(state=tk.NORMAL)
+        self.update_playback_controls()
         self.update_status_message(f"{traversal_name}: Готовий до 1-го кроку (з в {start_node + 1}).")
         return True
 
     def start_bfs(self):
-        if self._init_traversal("BFS", self._bfs_step_generator): self.execute_next_step()
+        if self._init_traversal("BFS"): self.execute_next_step()
 
     def start_dfs(self):
-        if self._init_traversal("DFS", self._dfs_step_generator): self.execute_next_step()
+        if self._init_traversal("DFS"): self.execute_next_step()
 
     def execute_next_step(self):
-        if not self.current_traversal_gen:
+        if self.recording is None or self.traversal_finished:
             self.update_status_message("Обхід не активний.");
             self.next_step_button.config(state=tk.DISABLED)
+            self.autoplay_button.config(state=tk.DISABLED)
             return
-        try:
-            step_details = next(self.current_traversal_gen)
-            self.process_traversal_step(step_details)
-        except StopIteration:
+        position = self.step_position
+        component_boundary = position == len(self.recording) or (
+                position > 0 and self.recording.codes[position] == EVENT_START_COMPONENT)
+        if not component_boundary:
+            self.process_traversal_step(self.recording.event(position))
+        else:
             self.add_to_protocol(f"{self.active_traversal_name}: Компонента завершена.")
-            next_start_node_component = self.find_start_node_for_traversal(for_new_component=True)
-            if next_start_node_component != -1:
+            if position < len(self.recording):
                 self.add_to_protocol(
-                    f"{self.active_traversal_name}: Початок нової компоненти з в {next_start_node_component + 1}.")
-                if self.active_traversal_name == "BFS":
-                    self.current_traversal_gen = self._bfs_step_generator(next_start_node_component)
-                else:
-                    self.current_traversal_gen = self._dfs_step_generator(next_start_node_component)
-                self.execute_next_step();
-                return
+                    f"{self.active_traversal_name}: Початок нової компоненти з в {self.recording.nodes[position] + 1}.")
+                self.process_traversal_step(self.recording.event(position))
             else:
                 self.add_to_protocol(f"{self.active_traversal_name}: Обхід повністю завершено.")
                 self.update_status_message(f"{self.active_traversal_name}: Завершено.")
-                self.next_step_button.config(state=tk.DISABLED)
+                self.traversal_finished = True
                 self.bfs_button.config(state=tk.NORMAL);
                 self.dfs_button.config(state=tk.NORMAL)
 
-                traversal_tree_matrix = self.get_traversal_tree_adj_matrix()
-                display_matrix(traversal_tree_matrix,
-                               f"Матриця дерева обходу ({self.active_traversal_name})")
+                traversal_result = self.recording.result()
+                if self.dense_tree_output:
+                    display_matrix(traversal_result.tree_matrix(),
+                                   f"Матриця дерева обходу ({self.active_traversal_name})")
+                    self.display_new_numbering()
+                else:
+                    self.display_traversal_vectors(traversal_result)
+        self.update_playback_controls()
 
-                self.display_new_numbering()
+    def execute_previous_step(self):
+        self.jump_to_step(self.step_position - 1)
 
-                if self.current_traversal_gen: self.current_traversal_gen.close()
-                self.current_traversal_gen = None
-        self.redraw_graph_canvas()
+    def jump_to_step(self, position):
+        if self.recording is None:
+            return
+        position = max(0, min(position, len(self.recording)))
+        if position == self.step_position:
+            return
+        self.autoplayer.pause()
+        node_states, tree_count, order_count = self.recording.state_at(position)
+        for node, node_state in enumerate(node_states): self.set_node_color(node, NODE_STATE_COLORS[node_state])
+        tree_edges = self.recording.tree_edges
+        for u_edge, v_edge in tree_edges[tree_count:self.tree_edge_count]:
+            self.set_edge_color(u_edge, v_edge, COLOR_DEFAULT_EDGE)
+        for u_edge, v_edge in tree_edges[self.tree_edge_count:tree_count]:
+            self.set_edge_color(u_edge, v_edge, COLOR_TREE_EDGE)
+        self.step_position, self.tree_edge_count, self.order_count = position, tree_count, order_count
+        self.traversal_finished = False
+        self.bfs_button.config(state=tk.DISABLED);
+        self.dfs_button.config(state=tk.DISABLED)
+        self.rebuild_protocol()
+        self.update_playback_controls()
+        self.update_status_message(f"{self.active_traversal_name}: Крок {position} з {len(self.recording)}.")
+
+    def rebuild_protocol(self):
+        self.protocol_log.clear()
+        self.add_to_protocol(f"--- {self.active_traversal_name}: перехід до кроку {self.step_position} ---")
+        for position in range(max(0, self.step_position - SCRUB_PROTOCOL_EVENTS), self.step_position):
+            step_type, node, parent = self.recording.event(position)
+            if step_type == EVENT_START_COMPONENT and position > 0:
+                self.add_to_protocol(f"{self.active_traversal_name}: Компонента завершена.")
+                self.add_to_protocol(f"{self.active_traversal_name}: Початок нової компоненти з в {node + 1}.")
+            self.add_to_protocol(self.format_traversal_step(step_type, node, parent))
+
+    def save_traversal_log(self):
+        if self.recording is None:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".trvl", filetypes=TRAVERSAL_LOG_FILETYPES)
+        if not path:
+            return
+        save_recording(self.recording, path)
+        self.update_status_message(f"Журнал обходу збережено у {path}")
 
-    def process_traversal_step(self, details):
-        step_type = details.get('type');
-        node = details.get('node');
-        parent = details.get('parent')
+    def load_traversal_log(self, path=None):
+        path = path or filedialog.askopenfilename(filetypes=TRAVERSAL_LOG_FILETYPES)
+        if not path:
+            return
+        try:
+            recording = load_recording(path)
+        except (OSError, ValueError) as error:
+            self.update_status_message(f"Не вдалося завантажити журнал: {error}")
+            return
+        if recording.num_vertices != self.num_vertices:
+            self.update_status_message(f"Журнал записано для графа з {recording.num_vertices} вершинами, "
+                                       f"а поточний граф має {self.num_vertices}.")
+            return
+        self.protocol_log.clear()
+        self.reset_traversal_state()
+        self.recording = recording
+        self.active_traversal_name = recording.kind
+        self.add_to_protocol(f"--- Завантажено журнал {recording.kind} ({len(recording)} подій) ---")
+        self.update_canvas_title()
+        self.bfs_button.config(state=tk.DISABLED);
+        self.dfs_button.config(state=tk.DISABLED)
+        self.update_playback_controls()
+        self.update_status_message(f"{recording.kind}: Журнал завантажено, готовий до відтворення.")
+
+    def format_traversal_step(self, step_type, node, parent):
         log_msg = f"{self.active_traversal_name}: "
-        if step_type == 'start_component':
-            self.node_colors[node] = COLOR_DISCOVERED_NODE
+        if step_type == EVENT_START_COMPONENT:
             log_msg += f"Старт компоненти з в {node + 1}."
-            if node not in self.node_new_numbering:
-                self.discovery_order_list.append(node)
-                self.node_new_numbering[node] = len(self.discovery_order_list)
-        elif step_type == 'discover':
-            self.node_colors[node] = COLOR_DISCOVERED_NODE
+        elif step_type == EVENT_DISCOVER:
             log_msg += f"Виявлено в {node + 1}"
-            if parent is not None:
-                self.tree_edges.add((parent, node))
+            if parent != NO_PARENT:
                 log_msg += f" з в {parent + 1}. Ребро ({parent + 1}-{node + 1}) - дерево."
             else:
                 log_msg += "."
-        elif step_type == 'process_start':
-            self.node_colors[node] = COLOR_PROCESSING_NODE
+        elif step_type == EVENT_PROCESS_START:
             log_msg += f"Обробка в {node + 1}."
-        elif step_type == 'process_finish':
-            self.node_colors[node] = COLOR_VISITED_NODE
+        elif step_type == EVENT_PROCESS_FINISH:
             log_msg += f"Завершено обробку в {node + 1}."
-        elif step_type == 'already_known':
+        elif step_type == EVENT_ALREADY_KNOWN:
             log_msg += f"З в {parent + 1}: сусід в {node + 1} вже відомий."
+        return log_msg
+
+    def process_traversal_step(self, details):
+        step_type, node, parent = details
+        node_state = EVENT_NODE_STATES[step_type]
+        if node_state != NODE_STATE_UNCHANGED:
+            self.set_node_color(node, NODE_STATE_COLORS[node_state])
+        if step_type == EVENT_DISCOVER:
+            self.order_count += 1
+            if parent != NO_PARENT:
+                self.set_edge_color(parent, node, COLOR_TREE_EDGE)
+                self.tree_edge_count += 1
+        self.step_position += 1
+        log_msg = self.format_traversal_step(step_type, node, parent)
         self.add_to_protocol(log_msg);
         self.update_status_message(log_msg)
 
-    def _bfs_step_generator(self, start_node_idx):
-        q = deque()
-        yield {'type': 'start_component', 'node': start_node_idx}
-        self.visited_globally[start_node_idx] = True
-        q.append(start_node_idx)
-        yield {'type': 'discover', 'node': start_node_idx, 'parent': None}
-        while q:
-            u = q.popleft()
-            yield {'type': 'process_start', 'node': u}
-            for v in range(self.num_vertices):
-                if self.adj_matrix[u][v] == 1:
-                    if not self.visited_globally[v]:
-                        self.visited_globally[v] = True
-                        if v not in self.node_new_numbering:
-                            self.discovery_order_list.append(v)
-                            self.node_new_numbering[v] = len(self.discovery_order_list)
-                        q.append(v)
-                        yield {'type': 'discover', 'node': v, 'parent': u}
-                    else:
-                        yield {'type': 'already_known', 'parent': u, 'node': v}
-            yield {'type': 'process_finish', 'node': u}
-
-    def _dfs_step_generator(self, start_node_idx):
-        stack = []
-        yield {'type': 'start_component', 'node': start_node_idx}
-        self.visited_globally[start_node_idx] = True
-        yield {'type': 'discover', 'node': start_node_idx, 'parent': None}
-        stack.append((start_node_idx, iter(range(self.num_vertices))))
-        yield {'type': 'process_start', 'node': start_node_idx}
-        while stack:
-            u, neighbors_iterator = stack[-1]
-            found_unvisited_child = False
-            for v in neighbors_iterator:
-                if self.adj_matrix[u][v] == 1:
-                    if not self.visited_globally[v]:
-                        self.visited_globally[v] = True
-                        if v not in self.node_new_numbering:
-                            self.discovery_order_list.append(v)
-                            self.node_new_numbering[v] = len(self.discovery_order_list)
-                        yield {'type': 'discover', 'node': v, 'parent': u}
-                        stack.append((v, iter(range(self.num_vertices))))
-                        yield {'type': 'process_start', 'node': v}
-                        found_unvisited_child = True;
-                        break
-                    else:
-                        yield {'type': 'already_known', 'parent': u, 'node': v}
-            if not found_unvisited_child:
-                stack.pop();
-                yield {'type': 'process_finish', 'node': u}
-
-    def get_traversal_tree_adj_matrix(self):
-        tree_adj_matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
-        if not self.tree_edges and not any(self.visited_globally):
-            return tree_adj_matrix
-        for u_node, v_node in self.tree_edges:
-            tree_adj_matrix[u_node][v_node] = 1
-        return tree_adj_matrix
+    def display_traversal_vectors(self, traversal_result):
+        display_vertex_vector(traversal_result.parent, f"Масив батьків дерева обходу "
+                                                       f"({self.active_traversal_name}, 0 - корінь або не відвідана)")
+        display_vertex_vector(traversal_result.order, f"Порядок відкриття вершин ({self.active_traversal_name})")
 
     def display_new_numbering(self):
         title = f"Список (вектор) відповідності номерів вершин ({self.active_traversal_name} - порядок відкриття)"
         print(f"\n--- {title} ---")
 
-        if not self.discovery_order_list:
+        if not self.order_count:
             print("Вершини не були відвідані або обхід не проводився.")
             return
 
-        for new_order_idx, original_vertex_idx in enumerate(self.discovery_order_list):
+        for new_order_idx, original_vertex_idx in enumerate(self.recording.order[:self.order_count]):
             print(f"Вершина {original_vertex_idx + 1} (стара нумерація) -> Нова нумерація {new_order_idx + 1}")
 
 
@@ -435,8 +596,9 @@ def main():
     display_matrix(directed_matrix, "Напрямлений граф (початковий)")
 
     root = tk.Tk()
-    app = GraphApp(root, directed_matrix)
+    app = GraphApp(root, directed_matrix, dense_tree_output=PRINT_DENSE_TREE)
     root.mainloop()
+    app.protocol_log.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,426 @@
+import struct
+from array import array
+from collections import deque
+
+from graph_csr import CSRGraph
+
+EVENT_START_COMPONENT = 0
+EVENT_DISCOVER = 1
+EVENT_PROCESS_START = 2
+EVENT_PROCESS_FINISH = 3
+EVENT_ALREADY_KNOWN = 4
+
+NO_PARENT = -1
+
+NODE_STATE_DEFAULT = 0
+NODE_STATE_DISCOVERED = 1
+NODE_STATE_PROCESSING = 2
+NODE_STATE_VISITED = 3
+NODE_STATE_UNCHANGED = -1
+EVENT_NODE_STATES = (NODE_STATE_DISCOVERED, NODE_STATE_DISCOVERED, NODE_STATE_PROCESSING, NODE_STATE_VISITED,
+                     NODE_STATE_UNCHANGED)
+
+BFS_FRONTIER_EDGE_WEIGHT = 2
+BFS_BOTTOM_UP_VERTEX_COST = 24
+
+MIN_SNAPSHOT_INTERVAL = 256
+TRAVERSAL_KINDS = ("BFS", "DFS")
+
+LOG_MAGIC = b"TRVL"
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct("<4sIIIqq")
+
+
+class TraversalResult:
+    __slots__ = ("kind", "order", "parent", "distance", "tree_edges")
+
+    def __init__(self, kind, order, parent, distance, tree_edges):
+        self.kind = kind
+        self.order = order
+        self.parent = parent
+        self.distance = distance
+        self.tree_edges = tree_edges
+
+    @property
+    def num_vertices(self):
+        return len(self.parent)
+
+    def tree_csr(self):
+        return CSRGraph.from_edges(self.num_vertices, self.tree_edges)
+
+    def tree_matrix(self):
+        matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
+        for u, v in self.tree_edges:
+            matrix[u][v] = 1
+        return matrix
+
+
+class TraversalEngine:
+    def __init__(self, graph):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_matrix(graph)
+        self.num_vertices = self.graph.num_vertices
+        self.neighbor_lists = self.graph.out_neighbor_view()
+        self.reset()
+
+    def reset(self):
+        self.visited = bytearray(self.num_vertices)
+        self.parent = array("i", [NO_PARENT]) * self.num_vertices
+        self.distance = array("i", [-1]) * self.num_vertices
+        self.order = array("i")
+        self.tree_edges = []
+        self.start_scan_position = 0
+
+    def find_start_node(self, for_new_component=False):
+        first_candidate = self.start_scan_position if for_new_component else 0
+        for i in range(first_candidate, self.num_vertices):
+            if self.neighbor_lists[i]:
+                if for_new_component:
+                    if not self.visited[i]:
+                        self.start_scan_position = i
+                        return i
+                else:
+                    return i
+        if for_new_component: self.start_scan_position = self.num_vertices
+        return -1
+
+    def _discover(self, v, u):
+        self.visited[v] = 1
+        self.order.append(v)
+        if u != NO_PARENT:
+            self.parent[v] = u
+            self.distance[v] = self.distance[u] + 1
+            self.tree_edges.append((u, v))
+        else:
+            self.distance[v] = 0
+
+    def bfs_steps(self, start_node):
+        yield EVENT_START_COMPONENT, start_node, NO_PARENT
+        self._discover(start_node, NO_PARENT)
+        q = deque([start_node])
+        yield EVENT_DISCOVER, start_node, NO_PARENT
+        while q:
+            u = q.popleft()
+            yield EVENT_PROCESS_START, u, NO_PARENT
+            for v in self.neighbor_lists[u]:
+                if not self.visited[v]:
+                    self._discover(v, u)
+                    q.append(v)
+                    yield EVENT_DISCOVER, v, u
+                else:
+                    yield EVENT_ALREADY_KNOWN, v, u
+            yield EVENT_PROCESS_FINISH, u, NO_PARENT
+
+    def dfs_steps(self, start_node):
+        yield EVENT_START_COMPONENT, start_node, NO_PARENT
+        self._discover(start_node, NO_PARENT)
+        yield EVENT_DISCOVER, start_node, NO_PARENT
+        offsets, targets = self.neighbor_lists.offsets, self.neighbor_lists.targets
+        stack = [(start_node, iter(range(offsets[start_node], offsets[start_node + 1])))]
+        yield EVENT_PROCESS_START, start_node, NO_PARENT
+        while stack:
+            u, positions = stack[-1]
+            for pos in positions:
+                v = targets[pos]
+                if not self.visited[v]:
+                    self._discover(v, u)
+                    yield EVENT_DISCOVER, v, u
+                    stack.append((v, iter(range(offsets[v], offsets[v + 1]))))
+                    yield EVENT_PROCESS_START, v, NO_PARENT
+                    break
+                yield EVENT_ALREADY_KNOWN, v, u
+            else:
+                stack.pop()
+                yield EVENT_PROCESS_FINISH, u, NO_PARENT
+
+    def steps(self, kind, start_node):
+        return self.bfs_steps(start_node) if kind == "BFS" else self.dfs_steps(start_node)
+
+    def _bfs_component(self, start_node):
+        self._discover(start_node, NO_PARENT)
+        q = deque([start_node])
+        while q:
+            u = q.popleft()
+            for v in self.neighbor_lists[u]:
+                if not self.visited[v]:
+                    self._discover(v, u)
+                    q.append(v)
+
+    def _dfs_component(self, start_node):
+        self._discover(start_node, NO_PARENT)
+        offsets, targets = self.neighbor_lists.offsets, self.neighbor_lists.targets
+        stack = [(start_node, iter(range(offsets[start_node], offsets[start_node + 1])))]
+        while stack:
+            u, positions = stack[-1]
+            for pos in positions:
+                v = targets[pos]
+                if not self.visited[v]:
+                    self._discover(v, u)
+                    stack.append((v, iter(range(offsets[v], offsets[v + 1]))))
+                    break
+            else:
+                stack.pop()
+
+    def run(self, kind):
+        self.reset()
+        traverse_component = self._bfs_component if kind == "BFS" else self._dfs_component
+        start_node = self.find_start_node()
+        while start_node != -1:
+            traverse_component(start_node)
+            start_node = self.find_start_node(for_new_component=True)
+        return self.result(kind)
+
+    def bfs_direction_optimizing(self, frontier_edge_weight=BFS_FRONTIER_EDGE_WEIGHT,
+                                 vertex_cost=BFS_BOTTOM_UP_VERTEX_COST):
+        self.reset()
+        graph = self.graph
+        n = self.num_vertices
+        visited = self.visited
+        out_degrees = graph.out_degrees()
+        in_degrees = graph.in_degrees()
+        not_in_frontier = n
+        frontier_position = None
+        unexplored_edges = sum(in_degrees)
+        unvisited = range(n)
+        start_node = self.find_start_node()
+        while start_node != -1:
+            self._discover(start_node, NO_PARENT)
+            unexplored_edges -= in_degrees[start_node]
+            frontier = [start_node]
+            while frontier:
+                frontier_edges = sum(map(out_degrees.__getitem__, frontier))
+                next_frontier = []
+                if frontier_edges * frontier_edge_weight > unexplored_edges + vertex_cost * (n - len(self.order)):
+                    if frontier_position is None:
+                        frontier_position = [not_in_frontier] * n
+                    for position, u in enumerate(frontier):
+                        frontier_position[u] = position
+                    unvisited = [v for v in unvisited if not visited[v]]
+                    reached = []
+                    get_position = frontier_position.__getitem__
+                    for v in unvisited:
+                        position = min(map(get_position, graph.in_neighbors(v)), default=not_in_frontier)
+                        if position != not_in_frontier:
+                            reached.append((position, v))
+                    for u in frontier:
+                        frontier_position[u] = not_in_frontier
+                    reached.sort()
+                    for position, v in reached:
+                        self._discover(v, frontier[position])
+                        next_frontier.append(v)
+                else:
+                    for u in frontier:
+                        for v in self.neighbor_lists[u]:
+                            if not visited[v]:
+                                self._discover(v, u)
+                                next_frontier.append(v)
+                unexplored_edges -= sum(map(in_degrees.__getitem__, next_frontier))
+                frontier = next_frontier
+            start_node = self.find_start_node(for_new_component=True)
+        return self.result("BFS")
+
+    def result(self, kind):
+        return TraversalResult(kind, self.order, self.parent, self.distance, self.tree_edges)
+
+    def record(self, kind, snapshot_interval=None):
+        self.reset()
+        codes, nodes, parents = array("b"), array("i"), array("i")
+        start_node = self.find_start_node()
+        while start_node != -1:
+            for code, node, parent in self.steps(kind, start_node):
+                codes.append(code)
+                nodes.append(node)
+                parents.append(parent)
+            start_node = self.find_start_node(for_new_component=True)
+        return TraversalRecording(kind, self.num_vertices, codes, nodes, parents, snapshot_interval)
+
+
+class ShortestPathIndex:
+    def __init__(self, graph):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_matrix(graph)
+        self.num_vertices = n = self.graph.num_vertices
+        self.out_lists = self.graph.out_neighbor_view()
+        self.in_lists = self.graph.in_neighbor_view()
+        self.forward_mark = [0] * n
+        self.forward_distance = [0] * n
+        self.forward_parent = [NO_PARENT] * n
+        self.backward_mark = [0] * n
+        self.backward_distance = [0] * n
+        self.backward_parent = [NO_PARENT] * n
+        self.stamp = 0
+
+    def _expand(self, frontier, adjacency, mark, distance, parent, other_mark, other_distance):
+        stamp = self.stamp
+        next_frontier = []
+        meeting_vertex, meeting_length = -1, 0
+        for u in frontier:
+            next_distance = distance[u] + 1
+            for v in adjacency[u]:
+                if mark[v] != stamp:
+                    mark[v] = stamp
+                    distance[v] = next_distance
+                    parent[v] = u
+                    next_frontier.append(v)
+                    if other_mark[v] == stamp:
+                        length = next_distance + other_distance[v]
+                        if meeting_vertex == -1 or length < meeting_length:
+                            meeting_vertex, meeting_length = v, length
+        return next_frontier, meeting_vertex
+
+    def _build_path(self, meeting_vertex):
+        path = []
+        v = meeting_vertex
+        while v != NO_PARENT:
+            path.append(v)
+            v = self.forward_parent[v]
+        path.reverse()
+        v = self.backward_parent[meeting_vertex]
+        while v != NO_PARENT:
+            path.append(v)
+            v = self.backward_parent[v]
+        return path
+
+    def query(self, source, target):
+        if source == target:
+            return 0, [source]
+        self.stamp += 1
+        self.forward_mark[source] = self.stamp
+        self.forward_distance[source] = 0
+        self.forward_parent[source] = NO_PARENT
+        self.backward_mark[target] = self.stamp
+        self.backward_distance[target] = 0
+        self.backward_parent[target] = NO_PARENT
+        forward_frontier, backward_frontier = [source], [target]
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_vertex = self._expand(
+                    forward_frontier, self.out_lists, self.forward_mark, self.forward_distance, self.forward_parent,
+                    self.backward_mark, self.backward_distance)
+            else:
+                backward_frontier, meeting_vertex = self._expand(
+                    backward_frontier, self.in_lists, self.backward_mark, self.backward_distance,
+                    self.backward_parent, self.forward_mark, self.forward_distance)
+            if meeting_vertex != -1:
+                hops = self.forward_distance[meeting_vertex] + self.backward_distance[meeting_vertex]
+                return hops, self._build_path(meeting_vertex)
+        return -1, []
+
+    def query_many(self, pairs):
+        return [self.query(source, target) for source, target in pairs]
+
+
+class TraversalRecording:
+    def __init__(self, kind, num_vertices, codes, nodes, parents, snapshot_interval=None, snapshots=None):
+        self.kind = kind
+        self.num_vertices = num_vertices
+        self.codes = codes
+        self.nodes = nodes
+        self.parents = parents
+        self.snapshot_interval = snapshot_interval or max(MIN_SNAPSHOT_INTERVAL, num_vertices)
+        self.order = array("i")
+        self.parent = array("i", [NO_PARENT]) * num_vertices
+        self.tree_edges = []
+        for code, node, parent in zip(codes, nodes, parents):
+            if code == EVENT_DISCOVER:
+                self.order.append(node)
+                if parent != NO_PARENT:
+                    self.parent[node] = parent
+                    self.tree_edges.append((parent, node))
+        if snapshots is None:
+            snapshots = self._build_snapshots()
+        self.snapshot_states, self.snapshot_tree_counts, self.snapshot_order_counts = snapshots
+
+    def __len__(self):
+        return len(self.codes)
+
+    def event(self, position):
+        return self.codes[position], self.nodes[position], self.parents[position]
+
+    def result(self):
+        distance = array("i", [-1]) * self.num_vertices
+        for v in self.order:
+            u = self.parent[v]
+            distance[v] = distance[u] + 1 if u != NO_PARENT else 0
+        return TraversalResult(self.kind, self.order, self.parent, distance, self.tree_edges)
+
+    def _apply_events(self, states, tree_count, order_count, start, end):
+        codes, nodes, parents = self.codes, self.nodes, self.parents
+        for i in range(start, end):
+            code = codes[i]
+            node_state = EVENT_NODE_STATES[code]
+            if node_state != NODE_STATE_UNCHANGED:
+                states[nodes[i]] = node_state
+            if code == EVENT_DISCOVER:
+                order_count += 1
+                if parents[i] != NO_PARENT:
+                    tree_count += 1
+        return tree_count, order_count
+
+    def _build_snapshots(self):
+        snapshot_states = bytearray()
+        tree_counts, order_counts = array("q"), array("q")
+        states = bytearray(self.num_vertices)
+        tree_count = order_count = 0
+        for start in range(0, len(self) + 1, self.snapshot_interval):
+            snapshot_states += states
+            tree_counts.append(tree_count)
+            order_counts.append(order_count)
+            end = min(start + self.snapshot_interval, len(self))
+            tree_count, order_count = self._apply_events(states, tree_count, order_count, start, end)
+        return snapshot_states, tree_counts, order_counts
+
+    def state_at(self, position):
+        snapshot_index = position // self.snapshot_interval
+        n = self.num_vertices
+        states = bytearray(self.snapshot_states[snapshot_index * n:(snapshot_index + 1) * n])
+        tree_count, order_count = self._apply_events(states, self.snapshot_tree_counts[snapshot_index],
+                                                     self.snapshot_order_counts[snapshot_index],
+                                                     snapshot_index * self.snapshot_interval, position)
+        return states, tree_count, order_count
+
+
+def _aligned(position):
+    return (position + 7) // 8 * 8
+
+
+def save_recording(recording, path):
+    sections = [recording.codes, recording.nodes, recording.parents, recording.snapshot_tree_counts,
+                recording.snapshot_order_counts, recording.snapshot_states]
+    with open(path, "wb") as log_file:
+        log_file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, TRAVERSAL_KINDS.index(recording.kind),
+                                       recording.snapshot_interval, recording.num_vertices, len(recording)))
+        for section in sections:
+            log_file.write(b"\0" * (_aligned(log_file.tell()) - log_file.tell()))
+            log_file.write(memoryview(section).cast("B"))
+
+
+def load_recording(path):
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    if len(data) < LOG_HEADER.size:
+        raise ValueError(f"Файл {path} не є журналом обходу")
+    magic, version, kind_index, snapshot_interval, num_vertices, num_events = LOG_HEADER.unpack_from(data, 0)
+    if magic != LOG_MAGIC or version != LOG_VERSION or kind_index >= len(TRAVERSAL_KINDS):
+        raise ValueError(f"Файл {path} не є журналом обходу")
+    num_snapshots = num_events // snapshot_interval + 1
+    position = LOG_HEADER.size
+
+    def take(typecode, count):
+        nonlocal position
+        position = _aligned(position)
+        section = array(typecode)
+        size = count * section.itemsize
+        section.frombytes(data[position:position + size])
+        position += size
+        return section
+
+    codes = take("b", num_events)
+    nodes = take("i", num_events)
+    parents = take("i", num_events)
+    tree_counts = take("q", num_snapshots)
+    order_counts = take("q", num_snapshots)
+    position = _aligned(position)
+    snapshot_states = bytearray(data[position:position + num_snapshots * num_vertices])
+    if len(snapshot_states) != num_snapshots * num_vertices:
+        raise ValueError(f"Журнал обходу {path} пошкоджено")
+    return TraversalRecording(TRAVERSAL_KINDS[kind_index], num_vertices, codes, nodes, parents, snapshot_interval,
+                              (snapshot_states, tree_counts, order_counts))
@@ -0,0 +1,73 @@
+import time
+
+AUTOPLAY_FRAME_MS = 16
+AUTOPLAY_FRAME_BUDGET_SECONDS = 0.010
+AUTOPLAY_DEFAULT_SPEED = 5
+AUTOPLAY_MIN_SPEED = 1
+AUTOPLAY_MAX_SPEED = 5000
+
+
+class AutoPlayer:
+    def __init__(self, widget, advance, can_advance, render=None, on_stop=None,
+                 steps_per_second=AUTOPLAY_DEFAULT_SPEED, frame_budget=AUTOPLAY_FRAME_BUDGET_SECONDS):
+        self.widget = widget
+        self.advance = advance
+        self.can_advance = can_advance
+        self.render = render
+        self.on_stop = on_stop
+        self.steps_per_second = steps_per_second
+        self.frame_budget = frame_budget
+        self.step_credit = 0.0
+        self.last_tick_time = 0.0
+        self.job = None
+
+    @property
+    def running(self):
+        return self.job is not None
+
+    def set_speed(self, steps_per_second):
+        self.steps_per_second = max(float(steps_per_second), AUTOPLAY_MIN_SPEED)
+
+    def start(self):
+        if self.running or not self.can_advance():
+            return False
+        self.step_credit = 1.0
+        self.last_tick_time = time.perf_counter()
+        self.job = self.widget.after(0, self._tick)
+        return True
+
+    def pause(self):
+        if self.job is None:
+            return
+        self.widget.after_cancel(self.job)
+        self.job = None
+        if self.on_stop:
+            self.on_stop()
+
+    def toggle(self):
+        if self.running:
+            self.pause()
+        else:
+            self.start()
+
+    def _tick(self):
+        self.job = None
+        frame_start = time.perf_counter()
+        self.step_credit += (frame_start - self.last_tick_time) * self.steps_per_second
+        self.last_tick_time = frame_start
+        steps_done = 0
+        while self.step_credit >= 1.0 and self.can_advance():
+            self.advance()
+            self.step_credit -= 1.0
+            steps_done += 1
+            if time.perf_counter() - frame_start >= self.frame_budget:
+                self.step_credit = 0.0
+                break
+        if steps_done and self.render:
+            self.render()
+        if not self.can_advance():
+            self.step_credit = 0.0
+            if self.on_stop:
+                self.on_stop()
+            return
+        self.job = self.widget.after(AUTOPLAY_FRAME_MS, self._tick)
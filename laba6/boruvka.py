@@ -0,0 +1,222 @@
+import math
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from graph_csr import CSRGraph, VERTEX_TYPECODE, WEIGHT_TYPECODE
+
+PARTITIONS_PER_WORKER = 4
+MIN_PARTITION_EDGES = 1 << 15
+
+_shared_blocks = []
+_edge_weights = None
+_edge_sources = None
+_edge_targets = None
+_components = None
+_best_slots = None
+_num_vertices = 0
+
+
+def _create_shared(source):
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(source) * source.itemsize))
+    block.buf[:len(source) * source.itemsize] = memoryview(source).cast("B")
+    return block
+
+
+def _attach_shared(block_names, num_vertices, num_edges, num_slots):
+    global _edge_weights, _edge_sources, _edge_targets, _components, _best_slots, _num_vertices
+    _detach_shared()
+    blocks = [shared_memory.SharedMemory(name=name) for name in block_names]
+    _shared_blocks[:] = blocks
+    weights_block, sources_block, targets_block, components_block, slots_block = blocks
+    _edge_weights = weights_block.buf[:num_edges * array(WEIGHT_TYPECODE).itemsize].cast(WEIGHT_TYPECODE)
+    _edge_sources = sources_block.buf[:num_edges * array(VERTEX_TYPECODE).itemsize].cast(VERTEX_TYPECODE)
+    _edge_targets = targets_block.buf[:num_edges * array(VERTEX_TYPECODE).itemsize].cast(VERTEX_TYPECODE)
+    _components = components_block.buf[:num_vertices * array(VERTEX_TYPECODE).itemsize].cast(VERTEX_TYPECODE)
+    _best_slots = slots_block.buf[:num_slots * num_vertices * array("q").itemsize].cast("q")
+    _num_vertices = num_vertices
+
+
+def _detach_shared():
+    global _edge_weights, _edge_sources, _edge_targets, _components, _best_slots
+    for view in (_edge_weights, _edge_sources, _edge_targets, _components, _best_slots):
+        if view is not None:
+            view.release()
+    _edge_weights = _edge_sources = _edge_targets = _components = _best_slots = None
+    for block in _shared_blocks:
+        block.close()
+    _shared_blocks.clear()
+
+
+def _scan_partition(slot, start, count, num_components):
+    end = start + count
+    n = _num_vertices
+    nn = n * n
+    components = _components
+    best_keys = [math.inf] * num_components
+    best_positions = [-1] * num_components
+    kept_weights = array(WEIGHT_TYPECODE)
+    kept_sources = array(VERTEX_TYPECODE)
+    kept_targets = array(VERTEX_TYPECODE)
+    position = start
+    last_u = component_u = -1
+    for weight, u, v in zip(_edge_weights[start:end].tolist(), _edge_sources[start:end].tolist(),
+                            _edge_targets[start:end].tolist()):
+        if u != last_u:
+            last_u = u
+            component_u = components[u]
+        component_v = components[v]
+        if component_u == component_v:
+            continue
+        kept_weights.append(weight)
+        kept_sources.append(u)
+        kept_targets.append(v)
+        key = weight * nn + u * n + v
+        if key < best_keys[component_u]:
+            best_keys[component_u] = key
+            best_positions[component_u] = position
+        if key < best_keys[component_v]:
+            best_keys[component_v] = key
+            best_positions[component_v] = position
+        position += 1
+    kept = position - start
+    _edge_weights[start:start + kept] = kept_weights
+    _edge_sources[start:start + kept] = kept_sources
+    _edge_targets[start:start + kept] = kept_targets
+    slot_start = slot * n
+    _best_slots[slot_start:slot_start + num_components] = array("q", best_positions)
+    return kept
+
+
+def _csr_edge_arrays(graph):
+    weights = array(WEIGHT_TYPECODE)
+    sources = array(VERTEX_TYPECODE)
+    targets = array(VERTEX_TYPECODE)
+    for u in range(graph.num_vertices):
+        end = graph.offsets[u + 1]
+        start = bisect_left(graph.targets, u + 1, graph.offsets[u], end)
+        if start == end:
+            continue
+        row_weights = graph.weights[start:end] if graph.weights is not None else [1] * (end - start)
+        row_targets = graph.targets[start:end]
+        if min(row_weights) <= 0:
+            row_targets = [v for v, weight in zip(row_targets, row_weights) if weight > 0]
+            row_weights = [weight for weight in row_weights if weight > 0]
+        weights.extend(row_weights)
+        targets.extend(row_targets)
+        sources.extend([u] * len(row_targets))
+    return weights, sources, targets
+
+
+def _edge_arrays(edges_with_weights):
+    if isinstance(edges_with_weights, CSRGraph):
+        return _csr_edge_arrays(edges_with_weights)
+    weights = array(WEIGHT_TYPECODE)
+    sources = array(VERTEX_TYPECODE)
+    targets = array(VERTEX_TYPECODE)
+    for weight, u, v in edges_with_weights:
+        if weight > 0:
+            weights.append(weight)
+            sources.append(u)
+            targets.append(v)
+    return weights, sources, targets
+
+
+def _find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+
+def _partitions(num_edges, workers):
+    parts = max(1, min(workers * PARTITIONS_PER_WORKER, num_edges // MIN_PARTITION_EDGES))
+    bounds = [num_edges * part // parts for part in range(parts + 1)]
+    return [[bounds[part], bounds[part + 1] - bounds[part]] for part in range(parts)]
+
+
+def parallel_boruvka_mst(num_vertices, edges_with_weights, workers=None):
+    weights, sources, targets = _edge_arrays(edges_with_weights)
+    num_edges = len(weights)
+    workers = workers or os.cpu_count() or 1
+    partitions = _partitions(num_edges, workers)
+    if len(partitions) == 1:
+        workers = 1
+
+    blocks = [_create_shared(weights), _create_shared(sources), _create_shared(targets),
+              _create_shared(array(VERTEX_TYPECODE, range(num_vertices))),
+              _create_shared(array("q", [-1]) * (len(partitions) * num_vertices))]
+    del weights, sources, targets
+    block_names = [block.name for block in blocks]
+    executor = None
+    try:
+        _attach_shared(block_names, num_vertices, num_edges, len(partitions))
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                           initargs=(block_names, num_vertices, num_edges, len(partitions)))
+        nn = num_vertices * num_vertices
+        num_components = num_vertices
+        mst_keys = []
+        while num_components > 1:
+            if executor is not None:
+                futures = [executor.submit(_scan_partition, slot, start, count, num_components)
+                           for slot, (start, count) in enumerate(partitions)]
+                kept_counts = [future.result() for future in futures]
+            else:
+                kept_counts = [_scan_partition(slot, start, count, num_components)
+                               for slot, (start, count) in enumerate(partitions)]
+
+            best_keys = [math.inf] * num_components
+            best_positions = [-1] * num_components
+            for slot, (partition, kept) in enumerate(zip(partitions, kept_counts)):
+                partition[1] = kept
+                slot_start = slot * num_vertices
+                for component, position in enumerate(_best_slots[slot_start:slot_start + num_components].tolist()):
+                    if position < 0:
+                        continue
+                    key = (_edge_weights[position] * nn + _edge_sources[position] * num_vertices
+                           + _edge_targets[position])
+                    if key < best_keys[component]:
+                        best_keys[component] = key
+                        best_positions[component] = position
+
+            components = _components
+            parent = list(range(num_components))
+            merged = False
+            for key, position in zip(best_keys, best_positions):
+                if position < 0:
+                    continue
+                root_u = _find(parent, components[_edge_sources[position]])
+                root_v = _find(parent, components[_edge_targets[position]])
+                if root_u != root_v:
+                    parent[root_v] = root_u
+                    mst_keys.append(key)
+                    merged = True
+            if not merged:
+                break
+
+            labels = [-1] * num_components
+            num_components = 0
+            for component in range(len(parent)):
+                root = _find(parent, component)
+                if labels[root] < 0:
+                    labels[root] = num_components
+                    num_components += 1
+                labels[component] = labels[root]
+            for vertex in range(num_vertices):
+                components[vertex] = labels[components[vertex]]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _detach_shared()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    mst_keys.sort()
+    mst_edges = [(key % nn // num_vertices, key % num_vertices, key // nn) for key in mst_keys]
+    return sum(edge[2] for edge in mst_edges), mst_edges
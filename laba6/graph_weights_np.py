@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+CHUNK_CELLS = 1 << 20
+WEIGHT_DTYPE = np.int16
+
+
+def _compatible_random_state(random_seed):
+    random.seed(random_seed)
+    _, internal_state, _ = random.getstate()
+    random_state = np.random.RandomState()
+    random_state.set_state(("MT19937", np.array(internal_state[:-1], dtype=np.uint32), internal_state[-1]))
+    return random_state
+
+
+def _chunk_rows(num_vertices):
+    return max(1, CHUNK_CELLS // max(1, num_vertices))
+
+
+def iter_uniform_row_chunks(num_vertices, seed, low=0.0, high=2.0):
+    draw = _compatible_random_state(seed).random_sample
+    chunk_rows = _chunk_rows(num_vertices)
+    for row_start in range(0, num_vertices, chunk_rows):
+        values = draw((min(chunk_rows, num_vertices - row_start), num_vertices))
+        values *= high - low
+        values += low
+        yield row_start, values
+
+
+def generate_Adir(num_vertices, k_coeff, seed, as_array=False):
+    adj_matrix = np.empty((num_vertices, num_vertices), dtype=np.uint8)
+    for row_start, values in iter_uniform_row_chunks(num_vertices, seed):
+        values *= k_coeff
+        np.greater_equal(values, 1.0, out=adj_matrix[row_start:row_start + len(values)], casting="unsafe")
+    return adj_matrix if as_array else adj_matrix.tolist()
+
+
+def generate_Aundir(Adir_matrix, as_array=False):
+    directed = np.asarray(Adir_matrix, dtype=bool).reshape(len(Adir_matrix), len(Adir_matrix))
+    undirected = directed | directed.T
+    np.fill_diagonal(undirected, False)
+    undirected = undirected.view(np.uint8)
+    return undirected if as_array else undirected.tolist()
+
+
+def _ceil_weights(num_vertices, seed, Aundir_matrix):
+    undirected = np.asarray(Aundir_matrix, dtype=np.uint8)
+    c_matrix = np.empty((num_vertices, num_vertices), dtype=np.uint8)
+    for row_start, values in iter_uniform_row_chunks(num_vertices, seed):
+        row_end = row_start + len(values)
+        values *= 100
+        values *= undirected[row_start:row_end]
+        np.ceil(values, out=values)
+        c_matrix[row_start:row_end] = values
+    return c_matrix
+
+
+def _iter_weight_row_chunks(num_vertices, seed, Aundir_matrix, upper_only):
+    c_matrix = _ceil_weights(num_vertices, seed, Aundir_matrix)
+    columns = np.arange(num_vertices)
+    chunk_rows = _chunk_rows(num_vertices)
+    for row_start in range(0, num_vertices, chunk_rows):
+        row_end = min(row_start + chunk_rows, num_vertices)
+        c_rows = c_matrix[row_start:row_end].astype(WEIGHT_DTYPE)
+        d_rows = c_rows > 0
+        d_columns = c_matrix[:, row_start:row_end].T > 0
+        multiplier = (d_rows != d_columns).astype(WEIGHT_DTYPE)
+        upper = columns > np.arange(row_start, row_end)[:, None]
+        weights = np.where(upper, (multiplier + d_rows + 1) * c_rows, 0)
+        if not upper_only:
+            lower = columns < np.arange(row_start, row_end)[:, None]
+            c_columns = c_matrix[:, row_start:row_end].T.astype(WEIGHT_DTYPE)
+            weights += np.where(lower, (multiplier + d_columns + 1) * c_columns, 0)
+        yield row_start, weights.astype(WEIGHT_DTYPE, copy=False)
+
+
+def generate_W(num_vertices, seed, Aundir_matrix, edges_only=False, as_array=False):
+    if edges_only:
+        edges = []
+        for row_start, weights in _iter_weight_row_chunks(num_vertices, seed, Aundir_matrix, upper_only=True):
+            rows, cols = np.nonzero(weights)
+            edges.extend(zip(weights[rows, cols].tolist(), (rows + row_start).tolist(), cols.tolist()))
+        return edges
+    W_matrix = np.empty((num_vertices, num_vertices), dtype=WEIGHT_DTYPE)
+    for row_start, weights in _iter_weight_row_chunks(num_vertices, seed, Aundir_matrix, upper_only=False):
+        W_matrix[row_start:row_start + len(weights)] = weights
+    return W_matrix if as_array else W_matrix.tolist()
@@ -1,8 +1,14 @@
 import tkinter as tk
+import heapq
 import math
 import random
+import time
+from collections import namedtuple
 from datetime import datetime
 
+from autoplay import AutoPlayer, AUTOPLAY_DEFAULT_SPEED, AUTOPLAY_MIN_SPEED, AUTOPLAY_MAX_SPEED
+from graph_csr import CSRGraph
+
 VARIANT_SEED = 4310
 N1, N2, N3, N4 = 4, 3, 1, 0
 NUM_VERTICES = 10 + N3
@@ -100,20 +106,46 @@ def display_matrix(matrix, description="Матриця"):
         print(f"{i + 1:2d} | {row_str}")
 
 
+MSTStep = namedtuple("MSTStep", ["u", "v", "weight", "status"])
+
+DENSE_PRIM_MIN_DENSITY = 0.25
+MST_ALGORITHM = "kruskal"
+
+
+class MSTCounters:
+    __slots__ = ("edges_examined", "edges_rejected", "find_calls", "phase_seconds")
+
+    def __init__(self, *phases):
+        self.edges_examined = 0
+        self.edges_rejected = 0
+        self.find_calls = 0
+        self.phase_seconds = dict.fromkeys(phases, 0.0)
+
+    def as_dict(self):
+        return {"edges_examined": self.edges_examined, "edges_rejected": self.edges_rejected,
+                "find_calls": self.find_calls, "phase_seconds": dict(self.phase_seconds)}
+
+
 class DSU:
     def __init__(self, num_vertices):
         self.parent = list(range(num_vertices))
         self.rank = [0] * num_vertices
+        self.find_calls = 0
 
     def find(self, i):
-        if self.parent[i] == i:
-            return i
-        self.parent[i] = self.find(self.parent[i])
-        return self.parent[i]
+        self.find_calls += 1
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
 
     def union(self, i, j):
-        root_i = self.find(i)
-        root_j = self.find(j)
+        return self.link(self.find(i), self.find(j))
+
+    def link(self, root_i, root_j):
         if root_i != root_j:
             if self.rank[root_i] < self.rank[root_j]:
                 self.parent[root_i] = root_j
@@ -126,38 +158,72 @@ class DSU:
         return False
 
 
-class KruskalAlgorithm:
-    def __init__(self, num_vertices, edges_with_weights):
-        self.num_vertices = num_vertices
-        self.all_edges = sorted([edge for edge in edges_with_weights if edge[0] > 0])
+class MSTAlgorithm:
+    title = "MST"
 
-        self.dsu = DSU(num_vertices)
+    def __init__(self, num_vertices, log=None, phases=("build", "scan")):
+        self.num_vertices = num_vertices
+        self.log = log
+        self.counters = MSTCounters(*phases)
         self.mst_edges = []
         self.mst_total_weight = 0
-        self.current_edge_index = 0
         self.last_considered_edge = None
 
+    def _consider(self, u, v, weight, accepted):
+        self.counters.edges_examined += 1
+        if self.log:
+            self.log(f"Розглядається ребро ({u + 1}-{v + 1}) з вагою {weight}.")
+        if accepted:
+            self.mst_edges.append((u, v, weight))
+            self.mst_total_weight += weight
+            self.last_considered_edge = MSTStep(u, v, weight, 'added')
+            if self.log:
+                self.log(f"  -> ДОДАНО. Нова вага MST: {self.mst_total_weight}")
+        else:
+            self.counters.edges_rejected += 1
+            self.last_considered_edge = MSTStep(u, v, weight, 'rejected')
+            if self.log:
+                self.log(f"  -> ВІДХИЛЕНО (утворює цикл).")
+        return self.last_considered_edge
+
+    def run(self):
+        while not self.is_done():
+            self.step()
+        return self.mst_total_weight, self.mst_edges
+
+
+class KruskalAlgorithm(MSTAlgorithm):
+    title = "Краскал"
+
+    def __init__(self, num_vertices, edges_with_weights, log=None):
+        super().__init__(num_vertices, log, phases=("heapify", "scan"))
+        phase_start = time.perf_counter()
+        if isinstance(edges_with_weights, CSRGraph):
+            edges_with_weights = edges_with_weights.weighted_edges(upper_only=True)
+        self.all_edges = [edge for edge in edges_with_weights if edge[0] > 0]
+        self.edge_heap = self.all_edges[:]
+        heapq.heapify(self.edge_heap)
+        self.counters.phase_seconds["heapify"] = time.perf_counter() - phase_start
+
+        self.dsu = DSU(num_vertices)
+        self.current_edge_index = 0
+
     def step(self):
         if self.is_done():
             self.last_considered_edge = None
-            return False
-
-        weight, u, v = self.all_edges[self.current_edge_index]
-
-        print(f"Розглядається ребро ({u + 1}-{v + 1}) з вагою {weight}.")
-
-        if self.dsu.find(u) != self.dsu.find(v):
-            if self.dsu.union(u, v):
-                self.mst_edges.append((u, v, weight))
-                self.mst_total_weight += weight
-                self.last_considered_edge = (u, v, weight, 'added')
-                print(f"  -> ДОДАНО. Нова вага MST: {self.mst_total_weight}")
-        else:
-            self.last_considered_edge = (u, v, weight, 'rejected')
-            print(f"  -> ВІДХИЛЕНО (утворює цикл).")
+            return None
 
+        phase_start = time.perf_counter()
+        weight, u, v = heapq.heappop(self.edge_heap)
+        step_result = self._consider(u, v, weight, self.dsu.link(self.dsu.find(u), self.dsu.find(v)))
         self.current_edge_index += 1
-        return True
+        self.counters.find_calls = self.dsu.find_calls
+        self.counters.phase_seconds["scan"] += time.perf_counter() - phase_start
+        return step_result
+
+    @property
+    def edges_exhausted(self):
+        return self.current_edge_index >= len(self.all_edges)
 
     def is_done(self):
         if self.num_vertices == 0:
@@ -169,6 +235,153 @@ class KruskalAlgorithm:
         return False
 
 
+class DensePrimAlgorithm(MSTAlgorithm):
+    title = "Прим, матриця"
+
+    def __init__(self, num_vertices, weight_matrix, log=None):
+        super().__init__(num_vertices, log)
+        phase_start = time.perf_counter()
+        if isinstance(weight_matrix, CSRGraph):
+            weight_matrix = weight_matrix.to_matrix()
+        self.weight_matrix = weight_matrix
+        self.key = [math.inf] * num_vertices
+        self.key_parent = [-1] * num_vertices
+        self.in_tree = bytearray(num_vertices)
+        self.tree_size = 0
+        self._all_edges = None
+        self.counters.phase_seconds["build"] = time.perf_counter() - phase_start
+
+    @property
+    def all_edges(self):
+        if self._all_edges is None:
+            self._all_edges = [(weight, u, v) for u, row in enumerate(self.weight_matrix)
+                               for v, weight in enumerate(row) if u < v and weight > 0]
+        return self._all_edges
+
+    def _attach(self, v):
+        self.in_tree[v] = 1
+        self.tree_size += 1
+        self.key[v] = math.inf
+        key, key_parent, in_tree = self.key, self.key_parent, self.in_tree
+        for u, weight in enumerate(self.weight_matrix[v]):
+            if 0 < weight < key[u] and not in_tree[u]:
+                key[u] = weight
+                key_parent[u] = v
+
+    def step(self):
+        if self.is_done():
+            self.last_considered_edge = None
+            return None
+        phase_start = time.perf_counter()
+        step_result = None
+        while self.tree_size < self.num_vertices:
+            best_key = min(self.key)
+            if best_key == math.inf:
+                self._attach(self.in_tree.index(0))
+                continue
+            v = self.key.index(best_key)
+            u = self.key_parent[v]
+            self._attach(v)
+            step_result = self._consider(min(u, v), max(u, v), best_key, True)
+            break
+        if step_result is None:
+            self.last_considered_edge = None
+        self.counters.phase_seconds["scan"] += time.perf_counter() - phase_start
+        return step_result
+
+    @property
+    def edges_exhausted(self):
+        return self.is_done()
+
+    def is_done(self):
+        return self.tree_size == self.num_vertices
+
+
+class HeapPrimAlgorithm(MSTAlgorithm):
+    title = "Прим, купа"
+
+    def __init__(self, num_vertices, weight_graph, log=None):
+        super().__init__(num_vertices, log)
+        phase_start = time.perf_counter()
+        if not isinstance(weight_graph, CSRGraph):
+            weight_graph = CSRGraph.from_edges(num_vertices, [edge for weight, u, v in weight_graph if weight > 0
+                                                              for edge in ((u, v, weight), (v, u, weight))],
+                                               weighted=True)
+        self.weight_graph = weight_graph
+        self.heap = []
+        self.in_tree = bytearray(num_vertices)
+        self.tree_size = 0
+        self._all_edges = None
+        self.counters.phase_seconds["build"] = time.perf_counter() - phase_start
+
+    @property
+    def all_edges(self):
+        if self._all_edges is None:
+            self._all_edges = [edge for edge in self.weight_graph.weighted_edges(upper_only=True) if edge[0] > 0]
+        return self._all_edges
+
+    def _attach(self, v):
+        self.in_tree[v] = 1
+        self.tree_size += 1
+        graph = self.weight_graph
+        start, end = graph.offsets[v], graph.offsets[v + 1]
+        for pos in range(start, end):
+            u = graph.targets[pos]
+            weight = graph.weights[pos] if graph.weights is not None else 1
+            if weight > 0 and not self.in_tree[u]:
+                heapq.heappush(self.heap, (weight, v, u))
+
+    def step(self):
+        if self.is_done():
+            self.last_considered_edge = None
+            return None
+        phase_start = time.perf_counter()
+        step_result = None
+        while self.tree_size < self.num_vertices:
+            if not self.heap:
+                self._attach(self.in_tree.index(0))
+                continue
+            weight, u, v = heapq.heappop(self.heap)
+            accepted = not self.in_tree[v]
+            if accepted:
+                self._attach(v)
+            step_result = self._consider(min(u, v), max(u, v), weight, accepted)
+            break
+        if step_result is None:
+            self.last_considered_edge = None
+        self.counters.phase_seconds["scan"] += time.perf_counter() - phase_start
+        return step_result
+
+    @property
+    def edges_exhausted(self):
+        return self.is_done()
+
+    def is_done(self):
+        return self.tree_size == self.num_vertices
+
+
+MST_ALGORITHMS = {
+    "kruskal": KruskalAlgorithm,
+    "prim_dense": DensePrimAlgorithm,
+    "prim_heap": HeapPrimAlgorithm,
+}
+
+
+def choose_mst_algorithm(num_vertices, num_edges):
+    max_edges = num_vertices * (num_vertices - 1) / 2
+    if max_edges and num_edges / max_edges >= DENSE_PRIM_MIN_DENSITY:
+        return "prim_dense"
+    return "prim_heap"
+
+
+def create_mst_algorithm(num_vertices, weight_graph, algorithm_name="auto", weight_matrix=None, log=None):
+    if algorithm_name == "auto":
+        algorithm_name = choose_mst_algorithm(num_vertices, weight_graph.num_edges // 2)
+    if algorithm_name == "prim_dense" and weight_matrix is not None:
+        return DensePrimAlgorithm(num_vertices, weight_matrix, log=log)
+    return MST_ALGORITHMS[algorithm_name](num_vertices, weight_graph, log=log)
+
+
 def calculate_vertex_positions(radius, vertex_count, center_x, center_y):
     positions = []
     for i in range(vertex_count):
@@ -196,9 +409,8 @@ def draw_edge(canvas, x1, y1, x2, y2, weight, color="gray", width=1, text_color=
 
 
 class GraphVisualizerApp:
-    def __init__(self, root_window):
+    def __init__(self, root_window, algorithm_name=MST_ALGORITHM):
         self.root = root_window
-        self.root.title(f"Журавель Анастасія, варіант: {VARIANT_SEED} - MST (Краскал)")
 
         self.Adir = generate_Adir(NUM_VERTICES, K_COEFF, VARIANT_SEED)
         self.Aundir = generate_Aundir(self.Adir)
@@ -213,13 +425,12 @@ class GraphVisualizerApp:
         self.mst_vertex_pos = calculate_vertex_positions(CIRCLE_RADIUS, NUM_VERTICES,
                                                          WINDOW_CENTER_X2, WINDOW_CENTER_Y_GRAPHS)
 
-        self.all_graph_edges_from_W = []
-        for i in range(NUM_VERTICES):
-            for j in range(i + 1, NUM_VERTICES):
-                if self.Aundir[i][j] == 1:
-                    self.all_graph_edges_from_W.append((self.W[i][j], i, j))
+        self.weight_graph = CSRGraph.from_matrix(self.W, weighted=True)
+        self.all_graph_edges_from_W = list(self.weight_graph.weighted_edges(upper_only=True))
 
-        self.kruskal_algo = KruskalAlgorithm(NUM_VERTICES, self.all_graph_edges_from_W)
+        self.mst_algo = create_mst_algorithm(NUM_VERTICES, self.weight_graph, algorithm_name,
+                                             weight_matrix=self.W, log=print)
+        self.root.title(f"Журавель Анастасія, варіант: {VARIANT_SEED} - MST ({self.mst_algo.title})")
 
         self.controls_frame = tk.Frame(self.root)
         self.controls_frame.pack(pady=10)
@@ -231,6 +442,17 @@ class GraphVisualizerApp:
         self.run_all_button = tk.Button(self.controls_frame, text="Виконати все", command=self.run_all_steps)
         self.run_all_button.pack(side=tk.LEFT, padx=5)
 
+        self.autoplayer = AutoPlayer(self.root, self.mst_algo.step, lambda: not self.mst_algo.is_done(),
+                                     render=self.render_autoplay_frame, on_stop=self.on_autoplay_stopped)
+        self.autoplay_button = tk.Button(self.controls_frame, text="Автовідтворення", command=self.toggle_autoplay)
+        self.autoplay_button.pack(side=tk.LEFT, padx=5)
+
+        self.speed_scale = tk.Scale(self.controls_frame, from_=AUTOPLAY_MIN_SPEED, to=AUTOPLAY_MAX_SPEED,
+                                    orient=tk.HORIZONTAL, label="Кроків/с", length=160,
+                                    command=self.autoplayer.set_speed)
+        self.speed_scale.set(AUTOPLAY_DEFAULT_SPEED)
+        self.speed_scale.pack(side=tk.LEFT, padx=5)
+
         self.text_y_offset_from_bottom = 25
 
         self.canvas = tk.Canvas(self.root, width=WINDOW_WIDTH, height=CANVAS_DRAW_HEIGHT, bg="white", borderwidth=1,
@@ -241,18 +463,20 @@ class GraphVisualizerApp:
 
         self.draw_initial_state()
 
-        has_positive_weight_edges = any(edge[0] > 0 for edge in self.kruskal_algo.all_edges)
+        has_positive_weight_edges = any(edge[0] > 0 for edge in self.mst_algo.all_edges)
 
         if NUM_VERTICES == 0:
             message = "УВАГА: Граф не має вершин."
             print(f"\n{message} MST не може бути побудовано.")
             self.next_step_button.config(state=tk.DISABLED)
             self.run_all_button.config(state=tk.DISABLED)
+            self.autoplay_button.config(state=tk.DISABLED)
         elif not has_positive_weight_edges and NUM_VERTICES > 0:
             message = "УВАГА: Граф не має ребер з позитивною вагою."
             print(f"\n{message} MST не може бути побудовано.")
             self.next_step_button.config(state=tk.DISABLED)
             self.run_all_button.config(state=tk.DISABLED)
+            self.autoplay_button.config(state=tk.DISABLED)
 
     def draw_initial_state(self):
         self.canvas.delete("all")
@@ -273,7 +497,7 @@ class GraphVisualizerApp:
             self.canvas.create_text(x2, y2, text=str(i + 1), fill="black", font=("Arial", 10, "bold"),
                                     tags=f"vt_mst_{i}")
 
-        for weight, u, v in self.kruskal_algo.all_edges:
+        for weight, u, v in self.mst_algo.all_edges:
             x1_orig, y1_orig = self.vertex_pos[u]
             x2_orig, y2_orig = self.vertex_pos[v]
             draw_edge(self.canvas, x1_orig, y1_orig, x2_orig, y2_orig, weight, color="gray", width=1)
@@ -284,50 +508,65 @@ class GraphVisualizerApp:
                                 font=("Arial", 12, "bold"), tags="mst_weight_text")
 
     def perform_step(self):
-        if not self.kruskal_algo.is_done():
-            step_performed = self.kruskal_algo.step()
+        if not self.mst_algo.is_done():
+            step_performed = self.mst_algo.step()
             if step_performed:
                 self.update_visualization()
-            if self.kruskal_algo.is_done():
+            if self.mst_algo.is_done():
                 self.finalize_algorithm_display()
         else:
             self.finalize_algorithm_display(already_done=True)
 
     def run_all_steps(self):
-        if not self.kruskal_algo.all_edges and NUM_VERTICES > 0:
+        if not self.mst_algo.all_edges and NUM_VERTICES > 0:
             print("Неможливо виконати всі кроки: немає ребер для розгляду.")
             return
-        if self.kruskal_algo.is_done():
+        if self.mst_algo.is_done():
             return
 
-        while not self.kruskal_algo.is_done():
-            self.kruskal_algo.step()
+        self.autoplayer.pause()
+        while not self.mst_algo.is_done():
+            self.mst_algo.step()
 
         self.update_visualization()
         self.finalize_algorithm_display()
 
+    def toggle_autoplay(self):
+        self.autoplayer.toggle()
+        if self.autoplayer.running:
+            self.autoplay_button.config(text="Пауза")
+
+    def on_autoplay_stopped(self):
+        self.autoplay_button.config(text="Автовідтворення")
+
+    def render_autoplay_frame(self):
+        self.update_visualization()
+        if self.mst_algo.is_done():
+            self.finalize_algorithm_display()
+
     def finalize_algorithm_display(self, already_done=False):
         if already_done and self.next_step_button['state'] == tk.DISABLED:
             return
 
-        print(f"\nПідсумкова вага MST: {self.kruskal_algo.mst_total_weight}")
-        final_mst_edges_str = ', '.join([f"({e[0] + 1}-{e[1] + 1}, {e[2]})" for e in self.kruskal_algo.mst_edges])
+        print(f"\nПідсумкова вага MST: {self.mst_algo.mst_total_weight}")
+        final_mst_edges_str = ', '.join([f"({e[0] + 1}-{e[1] + 1}, {e[2]})" for e in self.mst_algo.mst_edges])
         print(f"Ребра в MST: [{final_mst_edges_str if final_mst_edges_str else 'немає ребер'}]")
-        print(f"Кількість ребер в MST: {len(self.kruskal_algo.mst_edges)}")
+        print(f"Кількість ребер в MST: {len(self.mst_algo.mst_edges)}")
 
         if NUM_VERTICES > 1 and \
-                len(self.kruskal_algo.mst_edges) < NUM_VERTICES - 1 and \
-                self.kruskal_algo.current_edge_index >= len(self.kruskal_algo.all_edges) and \
+                len(self.mst_algo.mst_edges) < NUM_VERTICES - 1 and \
+                self.mst_algo.edges_exhausted and \
                 not already_done:
             print("УВАГА: Граф може бути незв'язним. Побудовано мінімальний остовний ліс.")
 
         self.next_step_button.config(state=tk.DISABLED)
         self.run_all_button.config(state=tk.DISABLED)
+        self.autoplay_button.config(state=tk.DISABLED)
 
         self.canvas.delete("mst_weight_text")
         y_coord_for_mst_weight = CANVAS_DRAW_HEIGHT - self.text_y_offset_from_bottom
         self.canvas.create_text(WINDOW_CENTER_X2, y_coord_for_mst_weight,
-                                text=f"Вага MST: {self.kruskal_algo.mst_total_weight}",
+                                text=f"Вага MST: {self.mst_algo.mst_total_weight}",
                                 font=("Arial", 12, "bold"), tags="mst_weight_text")
 
     def update_visualization(self):
@@ -335,17 +574,17 @@ class GraphVisualizerApp:
         self.canvas.delete("edge_weight")
         self.canvas.delete("mst_weight_text")
 
-        for weight_orig, u_orig, v_orig in self.kruskal_algo.all_edges:
+        for weight_orig, u_orig, v_orig in self.mst_algo.all_edges:
             x1, y1 = self.vertex_pos[u_orig]
             x2, y2 = self.vertex_pos[v_orig]
             draw_edge(self.canvas, x1, y1, x2, y2, weight_orig, color="lightgray", width=1)
 
-        for u_mst, v_mst, w_mst in self.kruskal_algo.mst_edges:
+        for u_mst, v_mst, w_mst in self.mst_algo.mst_edges:
             x1, y1 = self.vertex_pos[u_mst]
             x2, y2 = self.vertex_pos[v_mst]
             draw_edge(self.canvas, x1, y1, x2, y2, w_mst, color="green", width=2.5)
 
-        last_edge_info = self.kruskal_algo.last_considered_edge
+        last_edge_info = self.mst_algo.last_considered_edge
         if last_edge_info:
             u, v, weight, status = last_edge_info
             x1_curr, y1_curr = self.vertex_pos[u]
@@ -353,10 +592,10 @@ class GraphVisualizerApp:
 
             if status == 'rejected':
                 draw_edge(self.canvas, x1_curr, y1_curr, x2_curr, y2_curr, weight, color="red", width=3)
-            elif status == 'added' and not self.kruskal_algo.is_done():
+            elif status == 'added' and not self.mst_algo.is_done():
                 draw_edge(self.canvas, x1_curr, y1_curr, x2_curr, y2_curr, weight, color="lime green", width=3)
 
-        for u_mst, v_mst, weight_mst in self.kruskal_algo.mst_edges:
+        for u_mst, v_mst, weight_mst in self.mst_algo.mst_edges:
             x1_mst_draw, y1_mst_draw = self.mst_vertex_pos[u_mst]
             x2_mst_draw, y2_mst_draw = self.mst_vertex_pos[v_mst]
             draw_edge(self.canvas, x1_mst_draw, y1_mst_draw, x2_mst_draw, y2_mst_draw, weight_mst, color="forestgreen",
@@ -364,7 +603,7 @@ class GraphVisualizerApp:
 
         y_coord_for_mst_weight = CANVAS_DRAW_HEIGHT - self.text_y_offset_from_bottom
         self.canvas.create_text(WINDOW_CENTER_X2, y_coord_for_mst_weight,
-                                text=f"Вага MST: {self.kruskal_algo.mst_total_weight}",
+                                text=f"Вага MST: {self.mst_algo.mst_total_weight}",
                                 font=("Arial", 12, "bold"), tags="mst_weight_text")
 
 
@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import graph_weights_np as weights_np
+import main
+from graph_csr import CSRGraph
+
+
+@pytest.mark.parametrize("num_vertices, k_coeff, seed", [(11, 0.69, 4310), (11, 0.725, 4310), (40, 0.6, 1),
+                                                         (73, 0.9, 7), (1, 0.7, 3), (0, 0.7, 4310)])
+def test_matches_list_pipeline(num_vertices, k_coeff, seed):
+    expected_dir = main.generate_Adir(num_vertices, k_coeff, seed)
+    expected_undir = main.generate_Aundir(expected_dir)
+    expected_weights = main.generate_W(num_vertices, seed, expected_undir)
+
+    generated_dir = weights_np.generate_Adir(num_vertices, k_coeff, seed)
+    assert generated_dir == expected_dir
+    generated_undir = weights_np.generate_Aundir(generated_dir)
+    assert generated_undir == expected_undir
+    assert weights_np.generate_W(num_vertices, seed, generated_undir) == expected_weights
+
+    dir_array = weights_np.generate_Adir(num_vertices, k_coeff, seed, as_array=True)
+    undir_array = weights_np.generate_Aundir(dir_array, as_array=True)
+    assert isinstance(undir_array, np.ndarray) and undir_array.tolist() == expected_undir
+    assert weights_np.generate_W(num_vertices, seed, undir_array, as_array=True).tolist() == expected_weights
+
+
+@pytest.mark.parametrize("num_vertices, k_coeff, seed", [(11, 0.725, 4310), (60, 0.8, 2), (0, 0.7, 4310)])
+def test_edges_only_matches_upper_csr_edges(num_vertices, k_coeff, seed):
+    expected_weights = main.generate_W(num_vertices, seed,
+                                       main.generate_Aundir(main.generate_Adir(num_vertices, k_coeff, seed)))
+    expected_edges = list(CSRGraph.from_matrix(expected_weights, weighted=True).weighted_edges(upper_only=True))
+    undir = weights_np.generate_Aundir(weights_np.generate_Adir(num_vertices, k_coeff, seed))
+    assert weights_np.generate_W(num_vertices, seed, undir, edges_only=True) == expected_edges